@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+from caixas import calcular_cubo, dimensoes_do_grafico
+from desenhos import coluna_principal
+
+# Tipos de gráfico cujo desenho só precisa da tabela de frequências da coluna
+TIPOS_FREQUENCIA = ('pizza', 'contagem')
+# Tipos de gráfico desenhados a partir das caixas (quartis, bigodes, outliers) do cubo
+TIPOS_CAIXA = ('boxplot', 'catplot_box')
+
+
+def contar_valores(serie):
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        codigos = serie.cat.codes.to_numpy()
+        contagens = np.bincount(codigos[codigos >= 0], minlength=len(serie.cat.categories))
+        indice = pd.CategoricalIndex(serie.cat.categories, dtype=serie.dtype, name=serie.name)
+    else:
+        valores = serie.dropna().to_numpy()
+        if valores.size and pd.api.types.is_integer_dtype(serie.dtype):
+            minimo = valores.min()
+            contagens = np.bincount((valores - minimo).astype(np.int64))
+            presentes = contagens > 0
+            contagens = contagens[presentes]
+            indice = pd.Index(np.arange(minimo, minimo + len(presentes))[presentes], name=serie.name)
+        else:
+            return serie.value_counts()
+    contagens = pd.Series(contagens, index=indice, name='count')
+    return contagens.sort_values(ascending=False, kind='stable')
+
+
+def resumir_numerica(serie):
+    valores = serie.to_numpy(dtype='float64', na_value=np.nan)
+    valores = valores[~np.isnan(valores)]
+    if valores.size == 0:
+        return serie.astype('float64').describe()
+    minimo, q1, mediana, q3, maximo = np.percentile(valores, [0, 25, 50, 75, 100])
+    desvio = valores.std(ddof=1) if valores.size > 1 else np.nan
+    return pd.Series([float(valores.size), valores.mean(), desvio, minimo, q1, mediana, q3, maximo],
+                     index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'], name=serie.name)
+
+
+def colunas_para_agregar(specs):
+    frequencias, numericas = set(), set()
+    for spec in specs:
+        estatisticas = spec.get('estatisticas', [])
+        if spec['tipo'] in TIPOS_FREQUENCIA or {'contagem', 'contagem_indice', 'proporcao'} & set(estatisticas):
+            frequencias.add(coluna_principal(spec))
+        if spec['tipo'] == 'ranking_sim':
+            frequencias.update(spec['variaveis'])
+        if 'describe' in estatisticas:
+            numericas.add(coluna_principal(spec))
+    return frequencias, numericas
+
+
+def calcular_agregados(df, specs):
+    frequencias, numericas = colunas_para_agregar(specs)
+    agregados = {}
+    for col in frequencias:
+        agregados.setdefault(col, {})['contagens'] = contar_valores(df[col])
+    for col in numericas:
+        agregados.setdefault(col, {})['resumo'] = resumir_numerica(df[col])
+
+    # os mapas de calor compartilham uma única matriz, calculada sobre a união das variáveis
+    heatmaps = [spec for spec in specs if spec['tipo'] == 'heatmap_correlacao']
+    if heatmaps:
+        # o scipy (p-valores das correlações) só é importado quando há mapa de calor a desenhar
+        from correlacao import calcular_correlacoes
+        variaveis = sorted({col for spec in heatmaps for col in spec['variaveis']})
+        metodos = tuple({spec.get('metodo', 'pearson') for spec in heatmaps})
+        correlacoes = calcular_correlacoes(df, variaveis, metodos)
+        for col in variaveis:
+            agregados.setdefault(col, {})['correlacao'] = correlacoes
+
+    cubo = calcular_cubo(df, [(spec['y'], dimensoes_do_grafico(spec)) for spec in specs if spec['tipo'] in TIPOS_CAIXA])
+    for (medida, dimensoes), resumo in cubo.items():
+        agregados.setdefault(medida, {}).setdefault('caixas', {})[dimensoes] = resumo
+    return agregados
+
+
+def agregados_do_grafico(agregados, spec):
+    colunas = [coluna_principal(spec), spec.get('y')] + list(spec.get('variaveis', []))
+    return {col: agregados[col] for col in colunas if col in agregados}
@@ -0,0 +1,62 @@
+import argparse
+import importlib
+import sys
+import time
+
+# Bibliotecas caras de importar; --medir-importacao mostra quais o subcomando carregou
+MODULOS_PESADOS = ['numpy', 'pandas', 'pyarrow', 'scipy.stats', 'matplotlib.pyplot', 'seaborn']
+
+# subcomando: (módulo, argumentos fixos, ajuda). Cada módulo só é importado quando o seu subcomando roda.
+SUBCOMANDOS = {
+    'stats': ('main', ['--sem-graficos'], 'Só os cálculos estatísticos (sem seaborn nem matplotlib).'),
+    'charts': ('main', ['--sem-estatisticas'], 'Só os gráficos da análise (sem os testes).'),
+    'individuais': ('graphics', [], 'Os gráficos individuais.'),
+    'report': ('main', [], 'Gráficos e estatísticas, como o main.py.'),
+    'generate': ('dados', [], 'Gera dados sintéticos (só numpy e pandas).'),
+    'lote': ('lote', [], 'Relatório de vários arquivos e o combinado, num só processo.'),
+    'ondas': ('ondas', [], 'Acumula ondas novas da pesquisa e compara as ondas entre si.'),
+    'serve': ('servidor', [], 'Servidor local dos gráficos e tabelas.'),
+    'benchmark': ('benchmark', [], 'Tempo e memória de cada etapa em vários tamanhos de dados.'),
+}
+
+
+def medir_importacao(nome_modulo):
+    antes = set(sys.modules)
+    inicio = time.perf_counter()
+    modulo = importlib.import_module(nome_modulo)
+    segundos = time.perf_counter() - inicio
+    # o retrato é tirado logo após a importação: o que o main() carregar depois aparece à parte
+    return modulo, segundos, antes, set(sys.modules)
+
+
+def resumo_importacao(nome_modulo, segundos, antes, importados):
+    na_importacao = [m for m in MODULOS_PESADOS if m in importados and m not in antes]
+    na_execucao = [m for m in MODULOS_PESADOS if m in sys.modules and m not in importados]
+    print(f"\n--- Importação de '{nome_modulo}': {segundos * 1000:.0f} ms ---", file=sys.stderr)
+    print(f"Bibliotecas pesadas carregadas na importação: {', '.join(na_importacao) or 'nenhuma'}", file=sys.stderr)
+    print(f"Bibliotecas pesadas carregadas durante a execução: {', '.join(na_execucao) or 'nenhuma'}",
+          file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Análise do uso de internet pelos alunos.')
+    parser.add_argument('--medir-importacao', action='store_true',
+                        help='Mostra o tempo de importação do subcomando e as bibliotecas pesadas que ele carregou.')
+    subparsers = parser.add_subparsers(dest='comando', required=True, metavar='comando')
+    for nome, (_, _, ajuda) in SUBCOMANDOS.items():
+        subparsers.add_parser(nome, help=ajuda, add_help=False)
+    # tudo depois do subcomando (inclusive o --help) é repassado ao script correspondente
+    args, resto = parser.parse_known_args(argv)
+
+    nome_modulo, fixos, _ = SUBCOMANDOS[args.comando]
+    modulo, segundos, antes, importados = medir_importacao(nome_modulo)
+    try:
+        # o --help do subcomando é o do próprio script
+        modulo.main(fixos + resto)
+    finally:
+        if args.medir_importacao:
+            resumo_importacao(nome_modulo, segundos, antes, importados)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import matplotlib
+matplotlib.use('Agg')
+import pandas as pd
+import seaborn as sns
+
+import graphics
+import main as analise
+from agregacao import agregados_do_grafico, calcular_agregados
+from carregamento import ler_em_blocos
+from catalogo import GRAFICOS_ANALISE, GRAFICOS_INDIVIDUAIS
+from correlacao import calcular_correlacoes
+from dados import gerar_blocos, gravar_blocos
+from desenhos import desenhar
+from instrumentacao import pico_de_memoria
+from preparacao import adicionar_bits_uso, adicionar_faixas, codificar_colunas, converter_numericas, converter_renda
+from registro import selecionar_graficos
+from significancia import testes_em_lote
+
+TAMANHOS = (100, 10_000, 1_000_000, 10_000_000)
+PASTA_DADOS = '.benchmark'
+ARQUIVO_RESULTADO = 'benchmark.json'
+SEMENTE = 42
+VERSAO_RESULTADO = 1
+# Uma etapa regride quando fica mais que TOLERANCIA mais lenta (ou com pico de memória maior)
+# que a base; etapas abaixo de MINIMO_SEGUNDOS são ruído e não entram na comparação de tempo,
+# e na memória só contam acréscimos acima de MINIMO_MB.
+TOLERANCIA = 0.20
+TOLERANCIA_MEMORIA = 0.20
+MINIMO_SEGUNDOS = 0.05
+MINIMO_MB = 5
+# Gráficos que desenham aluno por aluno (o regplot ainda faz bootstrap do intervalo de confiança);
+# acima de --graficos-ate linhas eles ficam de fora para a rodada terminar.
+TIPOS_LINHA_A_LINHA = ('violino', 'regressao', 'dispersao')
+GRAFICOS_ATE = 1_000_000
+
+CONJUNTOS = {
+    'analise': (GRAFICOS_ANALISE, analise.tema),
+    'individuais': (GRAFICOS_INDIVIDUAIS, graphics.tema),
+}
+
+
+def parse_tamanhos(texto):
+    return sorted({int(float(parte)) for parte in texto.split(',') if parte.strip()})
+
+
+def dados_de_teste(n, pasta=PASTA_DADOS):
+    # gerados uma vez por tamanho e reaproveitados entre rodadas (mesma semente, mesmo arquivo)
+    caminho = os.path.join(pasta, f'dados_{n}.csv')
+    if not os.path.exists(caminho):
+        os.makedirs(pasta, exist_ok=True)
+        print(f"Gerando {n} linhas em '{caminho}'...")
+        gravar_blocos(gerar_blocos(n, semente=SEMENTE), caminho)
+    return caminho
+
+
+def medir(etapas, nome, funcao, *args):
+    # tempo de parede e pico de memória da etapa; a saída impressa pelos gráficos e testes é descartada
+    medida = {}
+    with pico_de_memoria(medida), contextlib.redirect_stdout(io.StringIO()):
+        inicio = time.perf_counter()
+        resultado = funcao(*args)
+        medida['segundos'] = round(time.perf_counter() - inicio, 6)
+    etapas[nome] = medida
+    pico = f"{medida['pico_mb']:10.1f} MB" if medida['pico_mb'] is not None else '         - MB'
+    print(f"  {nome:<28} {medida['segundos']:9.3f} s {pico}")
+    return resultado
+
+
+def medir_pipeline(caminho, n, graficos_ate=GRAFICOS_ATE, conjuntos=tuple(CONJUNTOS)):
+    etapas = {}
+    df = medir(etapas, 'leitura_csv', lambda: pd.concat(list(ler_em_blocos(caminho)), ignore_index=True))
+    medir(etapas, 'map_config', codificar_colunas, df)
+    medir(etapas, 'renda', converter_renda, df)
+    medir(etapas, 'numericas_e_faixas', lambda d: adicionar_faixas(adicionar_bits_uso(converter_numericas(d))), df)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        for conjunto in conjuntos:
+            specs, tema = CONJUNTOS[conjunto]
+            specs = selecionar_graficos(df, specs)
+            agregados = medir(etapas, f'agregacao:{conjunto}', calcular_agregados, df, specs)
+            sns.set_theme(**tema)
+            for spec in specs:
+                if spec['tipo'] in TIPOS_LINHA_A_LINHA and n > graficos_ate:
+                    continue
+                medir(etapas, f"grafico:{conjunto}:{spec['id']:02d}", desenhar, df, spec, pasta,
+                      agregados_do_grafico(agregados, spec))
+
+    medir(etapas, 'testes_em_lote', testes_em_lote, df)
+    medir(etapas, 'correlacoes', calcular_correlacoes, df)
+    return etapas
+
+
+def comparar(atual, base, tolerancia=TOLERANCIA, tolerancia_memoria=TOLERANCIA_MEMORIA,
+             minimo_segundos=MINIMO_SEGUNDOS, minimo_mb=MINIMO_MB):
+    regressoes = []
+    for n, etapas in atual['resultados'].items():
+        etapas_base = base['resultados'].get(n, {})
+        for nome, medida in etapas.items():
+            if nome not in etapas_base:
+                continue
+            anterior = etapas_base[nome]
+            if (max(medida['segundos'], anterior['segundos']) >= minimo_segundos
+                    and medida['segundos'] > anterior['segundos'] * (1 + tolerancia)):
+                regressoes.append((n, nome, 'segundos', anterior['segundos'], medida['segundos']))
+            if (medida['pico_mb'] is not None and anterior['pico_mb'] is not None
+                    and medida['pico_mb'] > anterior['pico_mb'] * (1 + tolerancia_memoria) + minimo_mb):
+                regressoes.append((n, nome, 'pico_mb', anterior['pico_mb'], medida['pico_mb']))
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Mede tempo e pico de memória de cada etapa do relatório.')
+    parser.add_argument('--tamanhos', type=parse_tamanhos, default=list(TAMANHOS),
+                        help='Linhas dos conjuntos de teste, ex.: --tamanhos 1e2,1e4 (padrão: 1e2,1e4,1e6,1e7).')
+    parser.add_argument('--conjunto', choices=list(CONJUNTOS), action='append',
+                        help='Só os gráficos desse conjunto; pode repetir (padrão: os dois).')
+    parser.add_argument('--graficos-ate', type=int, default=GRAFICOS_ATE,
+                        help='Acima dessas linhas não mede violino, regressão e dispersão.')
+    parser.add_argument('--saida', default=ARQUIVO_RESULTADO, help='Arquivo JSON com os resultados.')
+    parser.add_argument('--comparar', metavar='BASE_JSON',
+                        help='Compara com uma rodada anterior e termina com erro se alguma etapa regredir.')
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA,
+                        help='Aumento relativo de tempo aceito antes de acusar regressão (padrão: 0.20).')
+    parser.add_argument('--tolerancia-memoria', type=float, default=TOLERANCIA_MEMORIA,
+                        help='Aumento relativo do pico de memória aceito (padrão: 0.20).')
+    args = parser.parse_args(argv)
+
+    resultado = {'versao': VERSAO_RESULTADO, 'data': datetime.now().isoformat(timespec='seconds'),
+                 'python': platform.python_version(), 'plataforma': platform.platform(),
+                 'cpus': os.cpu_count(), 'pandas': pd.__version__, 'resultados': {}}
+    for n in args.tamanhos:
+        caminho = dados_de_teste(n)
+        print(f"\n--- {n} linhas ---")
+        resultado['resultados'][str(n)] = medir_pipeline(caminho, n, args.graficos_ate,
+                                                         args.conjunto or tuple(CONJUNTOS))
+
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, indent=2, ensure_ascii=False)
+    print(f"\nResultados gravados em '{args.saida}'.")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            base = json.load(f)
+        regressoes = comparar(resultado, base, args.tolerancia, args.tolerancia_memoria)
+        print(f"\n--- Comparação com '{args.comparar}' ({base.get('data', '?')}) ---")
+        if not regressoes:
+            print("Nenhuma regressão.")
+            return
+        for n, nome, medida, anterior, atual in regressoes:
+            variacao = f" ({atual / anterior - 1:+.0%})" if anterior else ''
+            print(f"REGRESSÃO {n:>9} linhas  {nome:<28} {medida}: {anterior:.3f} -> {atual:.3f}{variacao}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
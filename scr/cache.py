@@ -0,0 +1,81 @@
+import glob
+import hashlib
+import os
+
+from carregamento import ARQUIVO_DADOS, carregar_dados
+from instrumentacao import etapa
+from preparacao import bins_renda, bins_semestre, map_config, numeric_cols, tipos_colunas
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+PASTA_CACHE = '.cache_dados'
+# Incrementar quando a lógica de preparar_dados mudar sem alterar map_config.
+VERSAO_CACHE = 5
+
+
+def hash_fonte(caminho, tamanho_leitura=1 << 23):
+    h = hashlib.blake2b(digest_size=16)
+    with open(caminho, 'rb') as f:
+        for pedaco in iter(lambda: f.read(tamanho_leitura), b''):
+            h.update(pedaco)
+    config = (VERSAO_CACHE, sorted((col, sorted(m.items())) for col, m in map_config.items()),
+              sorted(tipos_colunas.items()), numeric_cols, bins_semestre, bins_renda)
+    h.update(repr(config).encode('utf-8'))
+    return h.hexdigest()
+
+
+def caminho_cache(caminho, chave, pasta_cache=PASTA_CACHE):
+    # o hash do caminho completo separa arquivos de mesmo nome em pastas diferentes: a limpeza das
+    # versões antigas de um não apaga o cache do outro
+    nome = os.path.splitext(os.path.basename(caminho))[0]
+    origem = hashlib.blake2b(os.path.abspath(caminho).encode('utf-8'), digest_size=4).hexdigest()
+    return os.path.join(pasta_cache, f'{nome}-{origem}-{chave}.feather')
+
+
+def ler_cache(arquivo):
+    with etapa('Leitura do cache feather', 'carregamento'):
+        return feather.read_table(arquivo, memory_map=True).to_pandas()
+
+
+def gravar_cache(df, arquivo):
+    # sem compressão para o próximo carregamento mapear o arquivo direto da memória
+    os.makedirs(os.path.dirname(arquivo) or '.', exist_ok=True)
+    temporario = arquivo + '.tmp'
+    with etapa('Gravação do cache feather', 'carregamento'):
+        feather.write_feather(df, temporario, compression='uncompressed')
+        os.replace(temporario, arquivo)
+    print(f"Cache '{arquivo}' gravado.")
+
+
+def _limpar_e_gravar(caminho, chave, pasta_cache, **kwargs):
+    df = carregar_dados(caminho, **kwargs)
+    for antigo in glob.glob(caminho_cache(caminho, '?' * len(chave), pasta_cache)):
+        os.remove(antigo)
+    gravar_cache(df, caminho_cache(caminho, chave, pasta_cache))
+    return df
+
+
+def carregar_dados_limpos(caminho=ARQUIVO_DADOS, pasta_cache=PASTA_CACHE, usar_cache=True, **kwargs):
+    if feather is None or not usar_cache:
+        return carregar_dados(caminho, **kwargs)
+
+    with etapa('Hash do arquivo de dados', 'carregamento'):
+        chave = hash_fonte(caminho)
+    arquivo = caminho_cache(caminho, chave, pasta_cache)
+    if os.path.exists(arquivo):
+        print(f"Usando cache '{arquivo}'.")
+        return ler_cache(arquivo)
+    return _limpar_e_gravar(caminho, chave, pasta_cache, **kwargs)
+
+
+def preparar_cache(caminho, pasta_cache=PASTA_CACHE, **kwargs):
+    # garante o feather dos dados limpos e devolve só o caminho dele: outro processo o mapeia
+    # da memória em vez de receber o DataFrame por pickle
+    chave = hash_fonte(caminho)
+    arquivo = caminho_cache(caminho, chave, pasta_cache)
+    if not os.path.exists(arquivo):
+        _limpar_e_gravar(caminho, chave, pasta_cache, **kwargs)
+    return arquivo
@@ -0,0 +1,33 @@
+import numpy as np
+from matplotlib import cbook
+
+from uso_internet import codigos_combinados, indice_combinado
+
+
+def dimensoes_do_grafico(spec):
+    return tuple(spec[k] for k in ('row', 'col', 'x') if k in spec)
+
+
+def resumos_por_grupo(df, medida, dimensoes):
+    # uma ordenação por (grupo, valor) e um corte por grupo; cada caixa é o mesmo
+    # boxplot_stats que o seaborn calcularia, mais a contagem
+    valores = df[medida].to_numpy(dtype='float64', na_value=np.nan)
+    codigos, niveis = codigos_combinados(df, list(dimensoes))
+    validos = (codigos >= 0) & ~np.isnan(valores)
+    codigos, valores = codigos[validos], valores[validos]
+    ordem = np.lexsort((valores, codigos))
+    codigos, valores = codigos[ordem], valores[ordem]
+    inicios = np.flatnonzero(np.r_[True, codigos[1:] != codigos[:-1]]) if len(codigos) else np.array([], dtype=int)
+    indice = indice_combinado(niveis)
+    resumos = {}
+    for codigo, grupo in zip(codigos[inicios], np.split(valores, inicios[1:])):
+        chave = indice[codigo] if isinstance(indice[codigo], tuple) else (indice[codigo],)
+        resumos[chave] = dict(cbook.boxplot_stats(grupo)[0], n=len(grupo))
+    return {'niveis': [list(n) for n in niveis], 'resumos': resumos}
+
+
+def calcular_cubo(df, pedidos):
+    # pedidos: pares (medida, dimensões); cada par é resumido uma única vez. Quartis não se somam
+    # entre células, então só as combinações pedidas pelos gráficos são resumidas, cada uma por inteiro
+    return {(medida, dimensoes): resumos_por_grupo(df, medida, dimensoes) for medida, dimensoes in set(pedidos)}
+
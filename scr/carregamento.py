@@ -0,0 +1,87 @@
+import codecs
+from functools import reduce
+
+import pandas as pd
+
+from instrumentacao import etapa
+from preparacao import padronizar_colunas, padronizar_nome, preparar_dados, tipos_colunas
+
+ARQUIVO_DADOS = 'dados_alunos.csv'
+TAMANHO_BLOCO = 250_000
+TAMANHO_AMOSTRA = 1 << 20
+
+
+def detectar_encoding(caminho, tamanho_amostra=TAMANHO_AMOSTRA):
+    with open(caminho, 'rb') as f:
+        amostra = f.read(tamanho_amostra)
+    if amostra.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    try:
+        # final=False tolera um caractere multibyte cortado no fim da amostra
+        codecs.getincrementaldecoder('utf-8')().decode(amostra, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+
+def tipos_para_cabecalho(caminho, encoding, sep=','):
+    with open(caminho, 'r', encoding=encoding) as f:
+        cabecalho = f.readline().rstrip('\r\n').split(sep)
+    return {col: tipos_colunas[padronizar_nome(col)] for col in cabecalho if padronizar_nome(col) in tipos_colunas}
+
+
+def ler_em_blocos(caminho=ARQUIVO_DADOS, tamanho_bloco=TAMANHO_BLOCO, encoding=None, usecols=None, tipos=True, sep=','):
+    encoding = encoding or detectar_encoding(caminho)
+    dtype = tipos_para_cabecalho(caminho, encoding, sep)
+    if not tipos:
+        # leitura tolerante: só a renda fica como texto, o resto é inferido e coagido na preparação
+        dtype = {col: t for col, t in dtype.items() if t == 'str'}
+    leitor = pd.read_csv(caminho, sep=sep, encoding=encoding, dtype=dtype, usecols=usecols, chunksize=tamanho_bloco)
+    with leitor:
+        for bloco in leitor:
+            yield padronizar_colunas(bloco)
+
+
+def agregar_em_blocos(parcial, combinar, caminho=ARQUIVO_DADOS, preparar=preparar_dados, **kwargs):
+    parciais = (parcial(preparar(bloco) if preparar else bloco) for bloco in ler_em_blocos(caminho, **kwargs))
+    return reduce(combinar, parciais)
+
+
+def contagens_em_blocos(colunas, caminho=ARQUIVO_DADOS, **kwargs):
+    def parcial(bloco):
+        return {col: bloco[col].value_counts() for col in colunas if col in bloco.columns}
+
+    def combinar(a, b):
+        return {col: a[col].add(b[col], fill_value=0).astype('int64') for col in a}
+
+    return agregar_em_blocos(parcial, combinar, caminho, **kwargs)
+
+
+def _preparar_medindo(bloco, preparar):
+    if not preparar:
+        return bloco
+    with etapa('Limpeza (preparar_dados, por bloco)', 'carregamento'):
+        return preparar(bloco)
+
+
+def _ler_e_preparar(caminho, preparar, **kwargs):
+    try:
+        return [_preparar_medindo(bloco, preparar) for bloco in ler_em_blocos(caminho, **kwargs)]
+    except UnicodeDecodeError:
+        # também é ValueError, mas reler com tipos tolerantes não resolve: o problema é o encoding
+        raise
+    except ValueError as e:
+        print(f"Aviso: tipos fixos falharam ({e}); relendo o arquivo com conversão tolerante.")
+        return [_preparar_medindo(bloco, preparar) for bloco in ler_em_blocos(caminho, tipos=False, **kwargs)]
+
+
+def carregar_dados(caminho=ARQUIVO_DADOS, preparar=preparar_dados, **kwargs):
+    # a leitura e a limpeza se alternam bloco a bloco: a etapa total inclui a limpeza, medida à parte
+    with etapa('Leitura e limpeza do CSV', 'carregamento'):
+        try:
+            blocos = _ler_e_preparar(caminho, preparar, **kwargs)
+        except UnicodeDecodeError as e:
+            # a amostra do detectar_encoding era UTF-8 válido, mas o arquivo não é; latin-1 lê qualquer byte
+            print(f"Aviso: o arquivo não é UTF-8 ({e.reason}); relendo como latin-1.")
+            blocos = _ler_e_preparar(caminho, preparar, **{**kwargs, 'encoding': 'latin-1'})
+        return pd.concat(blocos, ignore_index=True)
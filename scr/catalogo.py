@@ -0,0 +1,224 @@
+from preparacao import colunas_uso_internet
+
+device_order = ['Celular', 'Computador/Notebook', 'Tablet']
+
+# Gráficos individuais (graphics.py -> graficos_individuais/)
+GRAFICOS_INDIVIDUAIS = [
+    {'id': 1, 'tipo': 'histograma', 'coluna': 'idade', 'bins': 15,
+     'titulo': '1. Distribuição de Idade dos Estudantes', 'xlabel': 'Idade (Anos)', 'ylabel': 'Quantidade',
+     'arquivo': '01_idade_histograma.png', 'secao': 'Idade', 'estatisticas': ['describe'], 'rotulo': 'Idade'},
+    {'id': 2, 'tipo': 'pizza', 'coluna': 'sexo', 'cores': ['#66b3ff', '#ff9999'],
+     'titulo': '2. Distribuição por Sexo',
+     'arquivo': '02_sexo_pizza.png', 'secao': 'Sexo', 'estatisticas': ['contagem', 'proporcao'], 'rotulo': 'Sexo'},
+    {'id': 3, 'tipo': 'contagem', 'x': 'semestre_que_est_cursando', 'paleta': 'magma',
+     'titulo': '3. Distribuição de Estudantes por Semestre', 'xlabel': 'Semestre', 'ylabel': 'Quantidade',
+     'arquivo': '03_semestre_barras.png', 'secao': 'Semestre', 'estatisticas': ['contagem_indice'], 'rotulo': 'Semestre'},
+    {'id': 4, 'tipo': 'histograma', 'coluna': 'renda_familiar',
+     'titulo': '4. Distribuição de Renda Familiar', 'xlabel': 'Renda (R$)', 'ylabel': 'Quantidade',
+     'arquivo': '04_renda_histograma.png', 'secao': 'Renda Familiar', 'estatisticas': ['describe'], 'rotulo': 'Renda'},
+    {'id': 5, 'tipo': 'contagem', 'x': 'periodo', 'hue': 'periodo', 'paleta': 'coolwarm', 'figsize': (8, 6),
+     'titulo': '5. Distribuição por Período de Estudo', 'xlabel': 'Período', 'ylabel': 'Quantidade',
+     'arquivo': '05_periodo_barras.png', 'secao': 'Período', 'estatisticas': ['contagem'], 'rotulo': 'Período'},
+    {'id': 6, 'tipo': 'pizza', 'coluna': 'trabalha',
+     'titulo': '6. Você Trabalha?',
+     'arquivo': '06_trabalha_pizza.png', 'secao': 'Você Trabalha?', 'estatisticas': ['proporcao'], 'rotulo': 'Trabalha'},
+    {'id': 7, 'tipo': 'histograma', 'coluna': 'tempo_estudo_diario', 'bins': 10,
+     'titulo': '7. Distribuição do Tempo de Estudo Diário', 'xlabel': 'Horas de Estudo por Dia', 'ylabel': 'Quantidade',
+     'arquivo': '07_tempo_estudo_diario_hist.png', 'secao': 'Tempo de Estudo Diário', 'estatisticas': ['describe'],
+     'rotulo': 'Tempo Estudo Diário'},
+    {'id': 8, 'tipo': 'contagem', 'y': 'mora_com', 'hue': 'mora_com', 'ordem': 'frequencia',
+     'titulo': '8. Situação de Moradia', 'xlabel': 'Quantidade', 'ylabel': '',
+     'arquivo': '08_mora_com_barras.png', 'secao': 'Situação de Moradia', 'estatisticas': ['contagem'], 'rotulo': 'Mora Com'},
+    {'id': 9, 'tipo': 'contagem', 'y': 'h_quanto_tempo_utiliza_computador', 'hue': 'h_quanto_tempo_utiliza_computador',
+     'ordem': 'frequencia',
+     'titulo': '9. Há Quanto Tempo Utiliza Computador?', 'xlabel': 'Quantidade', 'ylabel': '',
+     'arquivo': '09_tempo_uso_pc_barras.png', 'secao': 'Há Quanto Tempo Utiliza Computador?',
+     'estatisticas': ['contagem'], 'rotulo': 'Tempo Uso PC'},
+    {'id': 10, 'tipo': 'pizza', 'coluna': 'voce_costuma_acessar_a_internet',
+     'titulo': '10. Você Costuma Acessar a Internet?',
+     'arquivo': '10_acessa_internet_pizza.png', 'secao': 'Você Costuma Acessar a Internet?',
+     'estatisticas': ['proporcao'], 'rotulo': 'Acessa Internet'},
+    {'id': 11, 'tipo': 'histograma', 'coluna': 'tempo_estudo_internet', 'bins': 10,
+     'titulo': '11. Distribuição do Tempo de Estudo na Internet', 'xlabel': 'Horas de Estudo na Internet por Dia',
+     'ylabel': 'Quantidade',
+     'arquivo': '11_tempo_estudo_internet_hist.png', 'secao': 'Tempo de Estudo na Internet',
+     'estatisticas': ['describe'], 'rotulo': 'Tempo Estudo Internet'},
+    {'id': 12, 'tipo': 'pizza', 'coluna': 'dispositivo_mais_acessado',
+     'titulo': '12. Dispositivo de Acesso Mais Utilizado',
+     'arquivo': '12_dispositivo_pizza.png', 'secao': 'Dispositivo de Acesso', 'estatisticas': ['proporcao'],
+     'rotulo': 'Dispositivo'},
+    {'id': 13, 'tipo': 'histograma', 'coluna': 'tempo_conectado_diario', 'bins': 12,
+     'titulo': '13. Tempo Diário Conectado à Internet', 'xlabel': 'Horas Conectado por Dia', 'ylabel': 'Quantidade',
+     'arquivo': '13_tempo_conectado_hist.png', 'secao': 'Tempo Conectado Diário', 'estatisticas': ['describe'],
+     'rotulo': 'Tempo Conectado'},
+]
+
+for i, col in enumerate(colunas_uso_internet, 14):
+    if i == 23: i = 25
+    titulo_amigavel = col.replace('usa_internet_', '').replace('_', ' ').capitalize()
+    GRAFICOS_INDIVIDUAIS.append(
+        {'id': i, 'tipo': 'pizza', 'coluna': col, 'cores': ['#99ff99', '#ff9999'],
+         'titulo': f'{i}. Usa a Internet para {titulo_amigavel}?',
+         'arquivo': f'{i}_{col}_pizza.png', 'secao': f'Usa a Internet para {titulo_amigavel}?',
+         'estatisticas': ['proporcao'], 'rotulo': titulo_amigavel})
+
+GRAFICOS_INDIVIDUAIS += [
+    {'id': 23, 'tipo': 'pizza', 'coluna': 'internet_atrapalha_formacao',
+     'titulo': '23. Acredita que a Internet Atrapalha a Formação?',
+     'arquivo': '23_internet_atrapalha_pizza.png', 'secao': 'Acredita que a Internet Atrapalha a Formação?',
+     'estatisticas': ['proporcao'], 'rotulo': 'Internet Atrapalha'},
+    {'id': 24, 'tipo': 'pizza', 'coluna': 'redes_sociais_ambiente_toxico',
+     'titulo': '24. Considera as Redes Sociais um Ambiente Tóxico?',
+     'arquivo': '24_redes_toxicas_pizza.png', 'secao': 'Considera as Redes Sociais um Ambiente Tóxico?',
+     'estatisticas': ['proporcao'], 'rotulo': 'Redes Tóxicas'},
+    {'id': 26, 'tipo': 'contagem', 'y': 'o_que_o_computador_representa_para_voce',
+     'hue': 'o_que_o_computador_representa_para_voce', 'ordem': 'frequencia',
+     'titulo': '26. O que o Computador Representa?', 'xlabel': 'Quantidade', 'ylabel': '',
+     'arquivo': '26_representacao_pc_barras.png', 'secao': 'O que o Computador Representa?',
+     'estatisticas': ['contagem'], 'rotulo': 'Representação PC'},
+    {'id': 27, 'tipo': 'contagem', 'y': 'sentimento_informatica', 'hue': 'sentimento_informatica', 'ordem': 'frequencia',
+     'titulo': '27. Sentimento em Relação à Informática', 'xlabel': 'Quantidade', 'ylabel': '',
+     'arquivo': '27_sentimento_informatica_barras.png', 'secao': 'Sentimento em Relação à Informática',
+     'estatisticas': ['contagem'], 'rotulo': 'Sentimento Informática'},
+]
+
+# Gráficos da análise (main.py -> graphics3/)
+GRAFICOS_ANALISE = [
+    {'id': 1, 'tipo': 'pizza', 'coluna': 'dispositivo_mais_acessado', 'figsize': (10, 10),
+     'textprops': {'fontsize': 14}, 'wedgeprops': dict(width=0.5),
+     'titulo': 'Dispositivo de Acesso Mais Utilizado', 'titulo_fontsize': 16,
+     'arquivo': '01_pizza_dispositivo.png'},
+    {'id': 2, 'tipo': 'contagem', 'y': 'mora_com', 'hue': 'mora_com', 'paleta': 'magma', 'ordem': 'frequencia',
+     'titulo': 'Situação de Moradia dos Estudantes', 'xlabel': 'Quantidade de Estudantes', 'ylabel': 'Mora Com',
+     'arquivo': '02_barras_moradia.png'},
+    {'id': 3, 'tipo': 'histograma', 'coluna': 'idade', 'cor': 'indigo', 'figsize': (12, 7),
+     'titulo': 'Distribuição de Idade dos Estudantes', 'xlabel': 'Idade (Anos)', 'ylabel': 'Contagem de Estudantes',
+     'arquivo': '03_histograma_idade.png'},
+    {'id': 4, 'tipo': 'histograma', 'coluna': 'renda_familiar', 'cor': 'teal', 'figsize': (12, 7),
+     'titulo': 'Distribuição de Renda Familiar', 'xlabel': 'Renda Familiar (R$)', 'ylabel': 'Contagem de Famílias',
+     'arquivo': '04_histograma_renda.png'},
+    {'id': 5, 'tipo': 'ranking_sim', 'variaveis': colunas_uso_internet, 'paleta': 'flare', 'figsize': (12, 8),
+     'titulo': 'Principais Finalidades de Uso da Internet', 'titulo_fontsize': 16,
+     'xlabel': 'Número de Estudantes (Respostas "Sim")', 'ylabel': 'Atividade Online',
+     'arquivo': '05_ranking_atividades.png'},
+    {'id': 6, 'tipo': 'contagem', 'y': 'sentimento_informatica', 'hue': 'sentimento_informatica', 'paleta': 'viridis',
+     'ordem': 'frequencia', 'figsize': (12, 7),
+     'titulo': 'Sentimento dos Estudantes em Relação à Informática', 'titulo_fontsize': 16,
+     'xlabel': 'Quantidade de Estudantes', 'ylabel': 'Sentimento Declarado',
+     'arquivo': '06_barras_sentimento.png'},
+    {'id': 7, 'tipo': 'violino', 'x': 'sexo', 'y': 'tempo_conectado_diario', 'paleta': 'pastel',
+     'titulo': 'Comparação e Distribuição do Tempo Conectado por Sexo', 'titulo_fontsize': 16,
+     'xlabel': 'Sexo', 'ylabel': 'Horas Conectado por Dia',
+     'arquivo': '07_violino_tempo_sexo.png'},
+    {'id': 8, 'tipo': 'regressao', 'x': 'tempo_conectado_diario', 'y': 'tempo_estudo_internet',
+     'titulo': 'Tempo Total Conectado vs. Tempo de Estudo na Internet', 'titulo_fontsize': 16,
+     'xlabel': 'Horas Totais Conectado por Dia', 'ylabel': 'Horas de Estudo na Internet por Dia',
+     'arquivo': '08_dispersao_tempo_total_vs_estudo.png'},
+    {'id': 9, 'tipo': 'heatmap_correlacao',
+     'variaveis': ['idade', 'renda_familiar', 'tempo_estudo_diario', 'tempo_conectado_diario'],
+     'nomes': ['Idade', 'Renda Familiar', 'Tempo de Estudo', 'Tempo Conectado'],
+     'paleta': 'plasma', 'annot_kws': {"size": 12},
+     'titulo': 'Mapa de Calor de Correlação entre Variáveis', 'titulo_fontsize': 16,
+     'arquivo': '09_heatmap_correlacao.png'},
+    {'id': 10, 'tipo': 'boxplot', 'x': 'periodo', 'y': 'renda_familiar', 'paleta': 'coolwarm',
+     'titulo': 'Distribuição da Renda Familiar por Período', 'xlabel': 'Período', 'ylabel': 'Renda Familiar (R$)',
+     'arquivo': '10_boxplot_renda_periodo.png'},
+    {'id': 11, 'tipo': 'empilhado', 'x': 'periodo', 'hue': 'trabalha', 'paleta': 'Accent',
+     'titulo': 'Trabalho por Período de Estudo', 'xlabel': 'Período', 'ylabel': 'Quantidade de Estudantes',
+     'arquivo': '11_empilhado_trabalho_periodo.png'},
+    {'id': 12, 'tipo': 'boxplot', 'x': 'sexo', 'y': 'tempo_estudo_diario', 'paleta': 'Set2',
+     'titulo': 'Tempo de Estudo Diário por Sexo', 'xlabel': 'Sexo', 'ylabel': 'Horas de Estudo por Dia',
+     'arquivo': '12_boxplot_estudo_sexo.png'},
+    {'id': 13, 'tipo': 'heatmap_correlacao',
+     'variaveis': ['idade', 'renda_familiar', 'tempo_estudo_diario', 'tempo_conectado_diario', 'tempo_estudo_internet'],
+     'paleta': 'coolwarm',
+     'titulo': 'Mapa de Calor - Correlação Ampliada',
+     'arquivo': '13_heatmap_ampliado.png'},
+    {'id': 14, 'tipo': 'dispersao', 'x': 'tempo_conectado_diario', 'y': 'tempo_estudo_internet', 'hue': 'sexo',
+     'paleta': 'Dark2',
+     'titulo': 'Tempo Estudo vs Tempo Conectado (por Sexo)', 'xlabel': 'Tempo Conectado (h/dia)',
+     'ylabel': 'Tempo Estudo na Internet (h/dia)',
+     'arquivo': '14_dispersao_sexo_estudo_conexao.png'},
+    {'id': 15, 'tipo': 'contagem', 'x': 'dispositivo_mais_acessado', 'hue': 'sexo', 'paleta': 'pastel',
+     'titulo': 'Dispositivo mais Usado por Sexo', 'xlabel': 'Dispositivo', 'ylabel': 'Quantidade de Estudantes',
+     'arquivo': '15_dispositivo_sexo.png'},
+
+    # *** GRAFICOS ADICIONAIS RELACIONANDO DISPOSITIVO E RENDA, JUNTO COM OUTROS ELEMENTOS FEITOS NA PESQUISA ***
+    {'id': 16, 'tipo': 'boxplot', 'x': 'dispositivo_mais_acessado', 'y': 'renda_familiar', 'paleta': 'viridis',
+     'ordem': device_order, 'figsize': (12, 7), 'grade': True, 'tight': True,
+     'titulo': 'Distribuição da Renda Familiar por Dispositivo Principal', 'titulo_fontsize': 16, 'rotulo_fontsize': 12,
+     'xlabel': 'Dispositivo Principal', 'ylabel': 'Renda Familiar (R$)',
+     'arquivo': '16_boxplot_renda_dispositivo.png', 'rotulo': 'Renda por Dispositivo'},
+    {'id': 17, 'tipo': 'catplot_box', 'x': 'dispositivo_mais_acessado', 'y': 'renda_familiar',
+     'col': 'periodo', 'row': 'trabalha', 'paleta': 'plasma', 'ordem': device_order,
+     'titulo': 'Renda vs. Dispositivo por Período de Estudo e Situação de Trabalho',
+     'xlabel': 'Dispositivo Principal', 'ylabel': 'Renda Familiar (R$)',
+     'arquivo': '17_catplot_renda_dispositivo_trabalho_periodo.png',
+     'rotulo': 'Renda, Dispositivo, Período, Trabalho'},
+    {'id': 18, 'tipo': 'boxplot', 'x': 'semestre', 'y': 'tempo_estudo_internet', 'paleta': 'magma',
+     'figsize': (12, 7), 'grade': True, 'tight': True,
+     'titulo': 'Distribuição do Tempo de Estudo na Internet por Semestre', 'titulo_fontsize': 16, 'rotulo_fontsize': 12,
+     'xlabel': 'Semestre', 'ylabel': 'Horas de Estudo na Internet',
+     'arquivo': '18_boxplot_estudo_semestre.png', 'rotulo': 'Estudo por Semestre'},
+    {'id': 19, 'tipo': 'proporcao_grupo', 'grupo': 'faixa_semestre', 'rotulo_grupo': 'Faixa de Semestre',
+     'variaveis': ['usa_internet_pesquisa', 'usa_internet_videos', 'usa_internet_jogos', 'usa_internet_trabalho'],
+     'paleta': 'crest', 'tight': True,
+     'titulo': 'Proporção de Finalidades de Uso da Internet por Faixa de Semestre', 'titulo_fontsize': 16,
+     'rotulo_fontsize': 12, 'xlabel': 'Faixa de Semestre', 'ylabel': 'Proporção de Estudantes (%)',
+     'arquivo': '19_barplot_finalidade_semestre.png', 'rotulo': 'Finalidade por Semestre'},
+    {'id': 20, 'tipo': 'proporcao_grupo', 'grupo': 'faixa_renda', 'rotulo_grupo': 'Faixa de Renda',
+     'variaveis': ['usa_internet_pesquisa', 'usa_internet_trabalho', 'usa_internet_compras', 'usa_internet_jogos'],
+     'paleta': 'flare', 'tight': True,
+     'titulo': 'Proporção de Finalidades de Uso da Internet por Faixa de Renda', 'titulo_fontsize': 16,
+     'rotulo_fontsize': 12, 'xlabel': 'Faixa de Renda Familiar', 'ylabel': 'Proporção de Estudantes (%)',
+     'arquivo': '20_barplot_finalidade_renda.png', 'rotulo': 'Finalidade por Renda'},
+    {'id': 21, 'tipo': 'boxplot', 'x': 'redes_sociais_ambiente_toxico', 'y': 'tempo_conectado_diario',
+     'paleta': 'coolwarm', 'grade': True, 'tight': True,
+     'titulo': 'Tempo Conectado vs. Percepção de Toxicidade nas Redes Sociais', 'titulo_fontsize': 16,
+     'rotulo_fontsize': 12, 'xlabel': 'Considera as Redes Sociais um Ambiente Tóxico?',
+     'ylabel': 'Horas Conectado Diariamente',
+     'arquivo': '21_boxplot_tempo_toxicidade.png', 'rotulo': 'Toxicidade vs. Tempo Online'},
+
+    # perguntas adicionais
+    {'id': 22, 'tipo': 'contagem', 'y': 'o_que_o_computador_representa_para_voce',
+     'hue': 'o_que_o_computador_representa_para_voce', 'paleta': 'crest', 'ordem': 'frequencia', 'figsize': (12, 8),
+     'titulo': 'O Que o Computador Representa para os Estudantes', 'titulo_fontsize': 16,
+     'xlabel': 'Quantidade de Estudantes', 'ylabel': 'Representação',
+     'arquivo': '22_barras_representacao_pc.png'},
+    {'id': 23, 'tipo': 'contagem', 'x': 'semestre_que_est_cursando', 'paleta': 'rocket', 'ordem': 'indice',
+     'figsize': (12, 7),
+     'titulo': 'Distribuição de Estudantes por Semestre', 'titulo_fontsize': 16,
+     'xlabel': 'Semestre', 'ylabel': 'Quantidade de Estudantes',
+     'arquivo': '23_barras_semestre.png'},
+    {'id': 24, 'tipo': 'contagem', 'y': 'h_quanto_tempo_utiliza_computador', 'hue': 'h_quanto_tempo_utiliza_computador',
+     'paleta': 'mako', 'ordem': 'frequencia', 'figsize': (12, 7),
+     'titulo': 'Tempo de Uso de Computador', 'titulo_fontsize': 16,
+     'xlabel': 'Quantidade de Estudantes', 'ylabel': 'Tempo de Uso',
+     'arquivo': '24_barras_tempo_uso_pc.png'},
+    {'id': 25, 'tipo': 'pizza', 'coluna': 'voce_costuma_acessar_a_internet', 'figsize': (10, 8),
+     'cores': ['#66c2a5', '#fc8d62'], 'textprops': {'fontsize': 14},
+     'titulo': 'Proporção de Estudantes que Acessam a Internet Regularmente', 'titulo_fontsize': 16,
+     'arquivo': '25_pizza_acessa_internet.png'},
+
+    # gráficos simples para perguntas básicas
+    {'id': 26, 'tipo': 'pizza', 'coluna': 'sexo', 'cores': ['#66b3ff', '#ff9999'],
+     'wedgeprops': {'edgecolor': 'white', 'linewidth': 1},
+     'titulo': 'Distribuição por Sexo', 'titulo_fontsize': 16,
+     'arquivo': '26_pizza_sexo.png', 'rotulo': 'Pizza Sexo'},
+    {'id': 27, 'tipo': 'contagem', 'x': 'periodo', 'hue': 'periodo', 'paleta': 'coolwarm',
+     'titulo': 'Distribuição de Estudantes por Período', 'titulo_fontsize': 16, 'rotulo_fontsize': 12,
+     'xlabel': 'Período de Estudo', 'ylabel': 'Quantidade de Estudantes',
+     'arquivo': '27_barras_periodo.png', 'rotulo': 'Barras Período'},
+    {'id': 28, 'tipo': 'pizza', 'coluna': 'trabalha', 'cores': ['#ffcc99', '#99ff99'],
+     'wedgeprops': {'edgecolor': 'white', 'linewidth': 1},
+     'titulo': 'Proporção de Estudantes que Trabalham', 'titulo_fontsize': 16,
+     'arquivo': '28_pizza_trabalha.png', 'rotulo': 'Pizza Trabalha'},
+    {'id': 29, 'tipo': 'pizza', 'coluna': 'internet_atrapalha_formacao', 'cores': ['#c2c2f0', '#ffb3e6'],
+     'wedgeprops': {'edgecolor': 'white', 'linewidth': 1},
+     'titulo': 'Percepção: A Internet Atrapalha a Formação?', 'titulo_fontsize': 16,
+     'arquivo': '29_pizza_internet_atrapalha.png', 'rotulo': 'Pizza Internet Atrapalha'},
+    {'id': 30, 'tipo': 'pizza', 'coluna': 'redes_sociais_ambiente_toxico', 'cores': ['#ff6666', '#ffb366'],
+     'wedgeprops': {'edgecolor': 'white', 'linewidth': 1},
+     'titulo': 'Percepção: Redes Sociais são um Ambiente Tóxico?', 'titulo_fontsize': 16,
+     'arquivo': '30_pizza_redes_toxicas.png', 'rotulo': 'Pizza Redes Tóxicas'},
+]
@@ -0,0 +1,163 @@
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from preparacao import colunas_faixas
+from significancia import colunas_numericas
+
+METODOS = ('pearson', 'spearman', 'kendall')
+ARQUIVO_CORRELACOES = 'correlacoes.csv'
+# Acima disso a tabela conjunta do Kendall fica grande demais e o par vai para o scipy
+CELULAS_KENDALL = 4_000_000
+
+
+def colunas_ordinais(df):
+    return [col for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype) and df[col].cat.ordered]
+
+
+def colunas_correlacionaveis(df):
+    # as faixas de semestre e renda são as próprias colunas numéricas recortadas
+    return colunas_numericas(df) + [col for col in colunas_ordinais(df) if col not in colunas_faixas]
+
+
+def valores_numericos(df, col):
+    # categorias ordenadas entram pelos códigos; faltantes (-1 ou NaN do to_numeric) viram NaN
+    if isinstance(df[col].dtype, pd.CategoricalDtype):
+        codigos = df[col].cat.codes.to_numpy().astype('float64')
+        codigos[codigos < 0] = np.nan
+        return codigos
+    return df[col].to_numpy(dtype='float64', na_value=np.nan)
+
+
+def postos_por_coluna(x):
+    postos = np.full(x.shape, np.nan)
+    for j in range(x.shape[1]):
+        validos = ~np.isnan(x[:, j])
+        postos[validos, j] = stats.rankdata(x[validos, j])
+    return postos
+
+
+def pearson_par_a_par(x):
+    # todas as somas parciais de uma vez, por produtos de matrizes com a máscara de presença:
+    # a célula (i, j) só usa as linhas em que as duas colunas estão presentes
+    presentes = ~np.isnan(x)
+    m = presentes.astype('float64')
+    x0 = np.where(presentes, x - np.nanmean(x, axis=0), 0.0)
+    n = m.T @ m
+    soma = x0.T @ m
+    soma_quadrados = (x0 ** 2).T @ m
+    produtos = x0.T @ x0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = produtos - soma * soma.T / n
+        var_i = soma_quadrados - soma ** 2 / n
+        r = cov / np.sqrt(var_i * var_i.T)
+    r = np.clip(r, -1, 1)
+    np.fill_diagonal(r, np.where(np.diag(n) > 1, 1.0, np.nan))
+    return r, n
+
+
+def p_valor_t(r, n):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = r * np.sqrt((n - 2) / (1 - r ** 2))
+        p = 2 * stats.t.sf(np.abs(t), n - 2)
+    p[np.abs(r) >= 1] = 0.0
+    p[n < 3] = np.nan
+    return p
+
+
+def spearman_par_a_par(x):
+    postos = postos_por_coluna(x)
+    r, n = pearson_par_a_par(postos)
+    # com faltantes diferentes entre as colunas, os postos do par precisam ser refeitos só nas linhas comuns
+    presentes = ~np.isnan(x)
+    for i in range(x.shape[1]):
+        for j in range(i + 1, x.shape[1]):
+            if not np.array_equal(presentes[:, i], presentes[:, j]):
+                comuns = presentes[:, i] & presentes[:, j]
+                if comuns.sum() > 1:
+                    r[i, j] = r[j, i] = stats.spearmanr(x[comuns, i], x[comuns, j]).statistic
+    return r, n
+
+
+def _empates(contagens):
+    contagens = contagens[contagens > 1].astype('float64')
+    return ((contagens * (contagens - 1) // 2).sum(), (contagens * (contagens - 1) * (contagens - 2)).sum(),
+            (contagens * (contagens - 1) * (2 * contagens + 5)).sum())
+
+
+def kendall_por_tabela(a, b):
+    # tau-b a partir da tabela conjunta dos valores distintos: pares concordantes e discordantes
+    # saem de somas acumuladas 2-D, sem comparar aluno com aluno
+    _, a = np.unique(a, return_inverse=True)
+    _, b = np.unique(b, return_inverse=True)
+    na, nb = a.max() + 1, b.max() + 1
+    tabela = np.bincount(a * nb + b, minlength=na * nb).reshape(na, nb).astype('float64')
+    abaixo_direita = np.zeros_like(tabela)
+    abaixo_esquerda = np.zeros_like(tabela)
+    acumulada = tabela[::-1].cumsum(axis=0)[::-1]
+    abaixo_direita[:-1, :-1] = acumulada[1:, ::-1].cumsum(axis=1)[:, ::-1][:, 1:]
+    abaixo_esquerda[:-1, 1:] = acumulada[1:].cumsum(axis=1)[:, :-1]
+    concordantes_menos_discordantes = (tabela * (abaixo_direita - abaixo_esquerda)).sum()
+
+    n = len(a)
+    total = n * (n - 1) / 2
+    empates_a, a0, a1 = _empates(tabela.sum(axis=1))
+    empates_b, b0, b1 = _empates(tabela.sum(axis=0))
+    if empates_a == total or empates_b == total:
+        return np.nan, np.nan
+    if empates_a == 0 and empates_b == 0:
+        # sem empates o scipy usa a distribuição exata em amostras pequenas
+        resultado = stats.kendalltau(a, b)
+        return resultado.statistic, resultado.pvalue
+    tau = concordantes_menos_discordantes / np.sqrt((total - empates_a) * (total - empates_b))
+    m = n * (n - 1.0)
+    var = ((m * (2 * n + 5) - a1 - b1) / 18 + (2 * empates_a * empates_b) / m + a0 * b0 / (9 * m * (n - 2)))
+    p = 2 * stats.norm.sf(abs(concordantes_menos_discordantes) / np.sqrt(var))
+    return float(np.clip(tau, -1, 1)), p
+
+
+def kendall_par_a_par(x):
+    k = x.shape[1]
+    tau, p = np.eye(k), np.zeros((k, k))
+    distintos = [len(np.unique(x[~np.isnan(x[:, j]), j])) for j in range(k)]
+    for i in range(k):
+        for j in range(i + 1, k):
+            comuns = ~np.isnan(x[:, i]) & ~np.isnan(x[:, j])
+            if comuns.sum() < 2:
+                tau[i, j] = tau[j, i] = p[i, j] = p[j, i] = np.nan
+            elif distintos[i] * distintos[j] <= CELULAS_KENDALL:
+                tau[i, j], p[i, j] = kendall_por_tabela(x[comuns, i], x[comuns, j])
+            else:
+                resultado = stats.kendalltau(x[comuns, i], x[comuns, j])
+                tau[i, j], p[i, j] = resultado.statistic, resultado.pvalue
+            tau[j, i], p[j, i] = tau[i, j], p[i, j]
+    return tau, p
+
+
+def calcular_correlacoes(df, colunas=None, metodos=METODOS):
+    colunas = colunas if colunas is not None else colunas_correlacionaveis(df)
+    x = np.column_stack([valores_numericos(df, col) for col in colunas])
+    correlacoes = {}
+    r, n = pearson_par_a_par(x)
+    correlacoes['n'] = n
+    if 'pearson' in metodos:
+        correlacoes['pearson'], correlacoes['p_pearson'] = r, p_valor_t(r, n)
+    if 'spearman' in metodos:
+        r_s, _ = spearman_par_a_par(x)
+        correlacoes['spearman'], correlacoes['p_spearman'] = r_s, p_valor_t(r_s, n)
+    if 'kendall' in metodos:
+        correlacoes['kendall'], correlacoes['p_kendall'] = kendall_par_a_par(x)
+    return {chave: pd.DataFrame(valor, index=colunas, columns=colunas) for chave, valor in correlacoes.items()}
+
+
+def tabela_longa(correlacoes):
+    colunas = list(correlacoes['n'].columns)
+    i, j = np.triu_indices(len(colunas), k=1)
+    linhas = []
+    for metodo in METODOS:
+        if metodo in correlacoes:
+            r, p = correlacoes[metodo].to_numpy(), correlacoes['p_' + metodo].to_numpy()
+            linhas.append(pd.DataFrame({'metodo': metodo, 'variavel_1': [colunas[a] for a in i],
+                                        'variavel_2': [colunas[b] for b in j], 'r': r[i, j], 'p_valor': p[i, j],
+                                        'n': correlacoes['n'].to_numpy()[i, j].astype(np.int64)}))
+    return pd.concat(linhas, ignore_index=True)
@@ -1,76 +1,220 @@
-import pandas as pd
+import argparse
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
+import pandas as pd
+
+ARQUIVO_SAIDA = "dados_alunos.csv"
+N_PADRAO = 100
+SEMENTE_PADRAO = 42
+TAMANHO_BLOCO = 250_000
+# Cada segmento de linhas tem o seu próprio fluxo aleatório (o filho de índice i de
+# SeedSequence(semente).spawn), então a linha i do arquivo é sempre a mesma, qualquer que seja o
+# tamanho do bloco ou o número de partes.
+TAMANHO_SEGMENTO = 10_000
+
+
+def fluxo_do_segmento(semente, indice):
+    return np.random.default_rng(np.random.SeedSequence(semente, spawn_key=(indice,)))
+
+
+def gerar_segmento(rng, inicio, n):
+    ids = np.arange(inicio + 1, inicio + n + 1)
+    idades = np.clip(rng.normal(22, 3, n).astype(int), 17, 35)
+    sexos = rng.choice([1, 2], size=n, p=[0.45, 0.55])
+    semestres = rng.choice(range(1, 11), size=n)
+    rendas = np.round(np.clip(rng.normal(4000, 1500, n), 1000, 12000), 0).astype(int)
+    periodos = rng.choice([1, 2], size=n, p=[0.6, 0.4])
+    trabalha = rng.choice([1, 2], size=n, p=[0.4, 0.6])
+    tempo_estudo_diario = np.round(np.clip(rng.normal(4.0, 1.5, n), 1, 8), 0).astype(int)
+    mora_com = rng.choice([1, 2, 3], size=n, p=[0.2, 0.3, 0.5])
+    tempo_uso_pc = np.clip(rng.normal(10, 2.5, n), 4, 16).astype(int)
+    acessa_internet = rng.choice([1, 2], size=n, p=[0.98, 0.02])
+    tempo_estudo_net = np.clip(tempo_estudo_diario * rng.uniform(0.3, 1.1, n), 1, 8).astype(int)
+    dispositivo = rng.choice([1, 2, 3], size=n, p=[0.6, 0.05, 0.35])
+    tempo_conectado = np.clip(rng.normal(7, 1.5, n), 3, 12).astype(int)
+
+    def binario(p):
+        return rng.choice([1, 2], size=n, p=[p, 1 - p])
+
+    usa_trabalho = binario(0.5)
+    usa_amigos = binario(0.85)
+    usa_desconhecido = binario(0.4)
+    usa_email = binario(0.7)
+    usa_pesquisa = binario(0.95)
+    usa_noticias = binario(0.6)
+    usa_compras = binario(0.5)
+    usa_videos = binario(0.9)
+    usa_jogos = binario(0.4)
+    atrapalha_formacao = binario(0.4)
+    toxidade_redes = binario(0.3)
+    usa_download = binario(0.5)
+
+    representa = rng.choice([1, 2, 3], size=n, p=[0.3, 0.3, 0.4])
+    sentimento_info = rng.choice([1, 2, 3], size=n, p=[0.5, 0.3, 0.2])
+
+    return pd.DataFrame({
+        "ID": ids,
+        "Idade": idades,
+        "Sexo": sexos,
+        "Semestre": semestres,
+        "Renda_familiar": rendas,
+        "Periodo": periodos,
+        "Trabalha": trabalha,
+        "Tempo_estudo_diario": tempo_estudo_diario,
+        "Mora_com": mora_com,
+        "Tempo_uso_computador": tempo_uso_pc,
+        "Costuma_acessar_internet": acessa_internet,
+        "Tempo_estudo_internet": tempo_estudo_net,
+        "Dispositivo_mais_acessado": dispositivo,
+        "Tempo_conectado_diario": tempo_conectado,
+        "Usa_internet_trabalho": usa_trabalho,
+        "Usa_internet_amigos": usa_amigos,
+        "Usa_internet_desconhecido": usa_desconhecido,
+        "Usa_internet_email": usa_email,
+        "Usa_internet_pesquisa": usa_pesquisa,
+        "Usa_internet_noticias": usa_noticias,
+        "Usa_internet_compras": usa_compras,
+        "Usa_internet_videos": usa_videos,
+        "Usa_internet_jogos": usa_jogos,
+        "Internet_atrapalha_formacao": atrapalha_formacao,
+        "Redes_sociais_ambiente_toxico": toxidade_redes,
+        "Usa_internet_download": usa_download,
+        "O_que_computador_representa": representa,
+        "Sentimento_informatica": sentimento_info
+    })
+
+
+def gerar_linhas(inicio, fim, semente=SEMENTE_PADRAO):
+    # segmentos inteiros sempre são sorteados por completo e depois recortados, para que o
+    # recorte [inicio, fim) não mude os valores sorteados
+    for indice in range(inicio // TAMANHO_SEGMENTO, -(-fim // TAMANHO_SEGMENTO)):
+        base = indice * TAMANHO_SEGMENTO
+        segmento = gerar_segmento(fluxo_do_segmento(semente, indice), base, TAMANHO_SEGMENTO)
+        yield segmento.iloc[max(inicio - base, 0):fim - base]
+
+
+def gerar_blocos(n=N_PADRAO, tamanho_bloco=TAMANHO_BLOCO, semente=SEMENTE_PADRAO, inicio=0):
+    pendentes, n_pendentes = [], 0
+    for segmento in gerar_linhas(inicio, inicio + n, semente):
+        pendentes.append(segmento)
+        n_pendentes += len(segmento)
+        while n_pendentes >= tamanho_bloco:
+            juntos = pd.concat(pendentes, ignore_index=True)
+            yield juntos.iloc[:tamanho_bloco]
+            pendentes = [juntos.iloc[tamanho_bloco:]]
+            n_pendentes = len(pendentes[0])
+    if n_pendentes:
+        yield pd.concat(pendentes, ignore_index=True)
+
+
+def formato_do_arquivo(caminho):
+    return 'parquet' if caminho.endswith('.parquet') else 'csv'
+
+
+def gravar_blocos(blocos, caminho, formato=None, cabecalho=True):
+    formato = formato or formato_do_arquivo(caminho)
+    temporario = caminho + '.tmp'
+    escritor, primeiro, total = None, None, 0
+    try:
+        for bloco in blocos:
+            if formato == 'parquet':
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                tabela = pa.Table.from_pandas(bloco, preserve_index=False)
+                if escritor is None:
+                    escritor = pq.ParquetWriter(temporario, tabela.schema)
+                escritor.write_table(tabela)
+            else:
+                bloco.to_csv(temporario, mode='w' if primeiro is None else 'a', header=cabecalho and primeiro is None,
+                              index=False)
+            if primeiro is None:
+                primeiro = bloco.head()
+            total += len(bloco)
+    finally:
+        if escritor is not None:
+            escritor.close()
+    os.replace(temporario, caminho)
+    return total, primeiro
+
+
+def dividir_em_partes(n, partes):
+    # fronteiras alinhadas aos segmentos, para que nenhum segmento seja sorteado por dois processos
+    segmentos = -(-n // TAMANHO_SEGMENTO)
+    por_parte = -(-segmentos // max(1, partes)) * TAMANHO_SEGMENTO
+    return [(inicio, min(inicio + por_parte, n)) for inicio in range(0, n, por_parte)]
+
+
+def caminho_da_parte(pasta, indice, formato):
+    return os.path.join(pasta, f"parte-{indice:05d}.{formato}")
+
+
+def _gerar_parte(indice, inicio, fim, tamanho_bloco, semente, pasta, formato):
+    # só a primeira parte CSV leva cabeçalho: as partes concatenadas em ordem formam o arquivo completo
+    caminho = caminho_da_parte(pasta, indice, formato)
+    total, _ = gravar_blocos(gerar_blocos(fim - inicio, tamanho_bloco, semente, inicio), caminho, formato,
+                             cabecalho=indice == 0)
+    return caminho, total
+
+
+def gerar_em_paralelo(n, pasta, partes=None, workers=None, tamanho_bloco=TAMANHO_BLOCO, semente=SEMENTE_PADRAO,
+                      formato='csv'):
+    workers = workers or os.cpu_count() or 1
+    intervalos = dividir_em_partes(n, partes or workers)
+    workers = min(workers, len(intervalos))
+    os.makedirs(pasta, exist_ok=True)
+    print(f"Gerando {n} linhas em {len(intervalos)} partes com {workers} processos...")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futuros = [executor.submit(_gerar_parte, i, inicio, fim, tamanho_bloco, semente, pasta, formato)
+                   for i, (inicio, fim) in enumerate(intervalos)]
+        return [futuro.result() for futuro in futuros]
+
+
+def juntar_partes_csv(caminhos, destino):
+    temporario = destino + '.tmp'
+    with open(temporario, 'wb') as saida:
+        for caminho in caminhos:
+            with open(caminho, 'rb') as parte:
+                shutil.copyfileobj(parte, saida, 16 * 1024 * 1024)
+    os.replace(temporario, destino)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Gera dados sintéticos do questionário, bloco a bloco.')
+    parser.add_argument('-n', type=int, default=N_PADRAO, help='Número de alunos (linhas).')
+    parser.add_argument('--bloco', type=int, default=TAMANHO_BLOCO, help='Linhas gravadas por bloco.')
+    parser.add_argument('--semente', type=int, default=SEMENTE_PADRAO)
+    parser.add_argument('--saida', default=ARQUIVO_SAIDA, help='Arquivo de saída (.csv ou .parquet).')
+    parser.add_argument('--formato', choices=['csv', 'parquet'], help='Padrão: pela extensão da saída.')
+    parser.add_argument('--partes', type=int, default=1,
+                        help='Divide as linhas em partes geradas em paralelo, gravadas na pasta de saída.')
+    parser.add_argument('--workers', type=int, help='Processos usados com --partes (padrão: núcleos da máquina).')
+    parser.add_argument('--juntar', action='store_true', help='Concatena as partes CSV em um único arquivo.')
+    args = parser.parse_args(argv)
+    if args.n < 1:
+        parser.error("-n precisa ser pelo menos 1.")
+    if args.bloco < 1:
+        parser.error("--bloco precisa ser pelo menos 1.")
+    formato = args.formato or formato_do_arquivo(args.saida)
+    if args.juntar and formato == 'parquet':
+        parser.error("--juntar só concatena partes CSV; com parquet, leia a pasta das partes como um dataset.")
+
+    if args.partes > 1:
+        pasta = os.path.splitext(args.saida)[0]
+        resultados = gerar_em_paralelo(args.n, pasta, args.partes, args.workers, args.bloco, args.semente, formato)
+        total = sum(linhas for _, linhas in resultados)
+        print(f"{total} linhas gravadas em {len(resultados)} partes na pasta '{pasta}'.")
+        if args.juntar:
+            juntar_partes_csv([caminho for caminho, _ in resultados], args.saida)
+            print(f"Partes concatenadas em '{args.saida}'.")
+        return
+
+    total, primeiro = gravar_blocos(gerar_blocos(args.n, args.bloco, args.semente), args.saida, args.formato)
+    print(primeiro)
+    print(f"{total} linhas gravadas em '{args.saida}'.")
+
 
-np.random.seed(42)
-N = 100
-
-ids = np.arange(1, N + 1)
-idades = np.clip(np.random.normal(22, 3, N).astype(int), 17, 35)
-sexos = np.random.choice([1, 2], size=N, p=[0.45, 0.55])
-semestres = np.random.choice(range(1, 11), size=N)
-rendas = np.round(np.clip(np.random.normal(4000, 1500, N), 1000, 12000), 0).astype(int)
-periodos = np.random.choice([1, 2], size=N, p=[0.6, 0.4])
-trabalha = np.random.choice([1, 2], size=N, p=[0.4, 0.6])
-tempo_estudo_diario = np.round(np.clip(np.random.normal(4.0, 1.5, N), 1, 8), 0).astype(int)
-mora_com = np.random.choice([1, 2, 3], size=N, p=[0.2, 0.3, 0.5])
-tempo_uso_pc = np.clip(np.random.normal(10, 2.5, N), 4, 16).astype(int)
-acessa_internet = np.random.choice([1, 2], size=N, p=[0.98, 0.02])
-tempo_estudo_net = np.clip(tempo_estudo_diario * np.random.uniform(0.3, 1.1, N), 1, 8).astype(int)
-dispositivo = np.random.choice([1, 2, 3], size=N, p=[0.6, 0.05, 0.35])
-tempo_conectado = np.clip(np.random.normal(7, 1.5, N), 3, 12).astype(int)
-
-
-def binario(p):
-    return np.random.choice([1, 2], size=N, p=[p, 1 - p])
-
-usa_trabalho = binario(0.5)
-usa_amigos = binario(0.85)
-usa_desconhecido = binario(0.4)
-usa_email = binario(0.7)
-usa_pesquisa = binario(0.95)
-usa_noticias = binario(0.6)
-usa_compras = binario(0.5)
-usa_videos = binario(0.9)
-usa_jogos = binario(0.4)
-atrapalha_formacao = binario(0.4)
-toxidade_redes = binario(0.3)
-usa_download = binario(0.5)
-
-
-representa = np.random.choice([1, 2, 3], size=N, p=[0.3, 0.3, 0.4])
-sentimento_info = np.random.choice([1, 2, 3], size=N, p=[0.5, 0.3, 0.2])
-
-
-df = pd.DataFrame({
-    "ID": ids,
-    "Idade": idades,
-    "Sexo": sexos,
-    "Semestre": semestres,
-    "Renda_familiar": rendas,
-    "Periodo": periodos,
-    "Trabalha": trabalha,
-    "Tempo_estudo_diario": tempo_estudo_diario,
-    "Mora_com": mora_com,
-    "Tempo_uso_computador": tempo_uso_pc,
-    "Costuma_acessar_internet": acessa_internet,
-    "Tempo_estudo_internet": tempo_estudo_net,
-    "Dispositivo_mais_acessado": dispositivo,
-    "Tempo_conectado_diario": tempo_conectado,
-    "Usa_internet_trabalho": usa_trabalho,
-    "Usa_internet_amigos": usa_amigos,
-    "Usa_internet_desconhecido": usa_desconhecido,
-    "Usa_internet_email": usa_email,
-    "Usa_internet_pesquisa": usa_pesquisa,
-    "Usa_internet_noticias": usa_noticias,
-    "Usa_internet_compras": usa_compras,
-    "Usa_internet_videos": usa_videos,
-    "Usa_internet_jogos": usa_jogos,
-    "Internet_atrapalha_formacao": atrapalha_formacao,
-    "Redes_sociais_ambiente_toxico": toxidade_redes,
-    "Usa_internet_download": usa_download,
-    "O_que_computador_representa": representa,
-    "Sentimento_informatica": sentimento_info
-})
-
-df.to_csv("dados_alunos.csv", index=False)
-print(df.head())
+if __name__ == '__main__':
+    main()
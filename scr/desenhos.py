@@ -0,0 +1,356 @@
+import colorsys
+import io
+import os
+import pickle
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+from caixas import dimensoes_do_grafico
+from instrumentacao import etapa
+from manifesto import nome_de_saida
+from uso_internet import proporcoes_por_grupo
+
+DPI_FINAL = 300
+# Figuras modelo das pizzas e contagens, reaproveitadas de um gráfico para o outro: criar a figura e os
+# eixos custa mais que desenhar as fatias ou barras, e entre dois gráficos do mesmo tipo só mudam os
+# artistas acrescentados, os textos e o título.
+# (tipo, orientação, figsize, grade, estilo) -> (figura, margens originais)
+_modelos = {}
+
+
+def coluna_principal(spec):
+    return spec.get('coluna') or spec.get('x') or spec.get('y')
+
+
+def contagens_da_coluna(df, coluna, agregados):
+    if coluna in agregados and 'contagens' in agregados[coluna]:
+        return agregados[coluna]['contagens']
+    return df[coluna].value_counts()
+
+
+def imprimir_estatisticas(df, spec, agregados=None):
+    agregados = agregados or {}
+    if 'secao' in spec:
+        print(f"\n--- Análise Numérica: {spec['id']}. {spec['secao']} ---")
+    coluna = coluna_principal(spec)
+    for tipo in spec.get('estatisticas', []):
+        if tipo == 'describe':
+            resumo = agregados.get(coluna, {}).get('resumo')
+            print((resumo if resumo is not None else df[coluna].describe()).round(2))
+            continue
+        contagens = contagens_da_coluna(df, coluna, agregados)
+        if tipo == 'contagem':
+            print(contagens)
+        elif tipo == 'contagem_indice':
+            print(contagens.sort_index())
+        elif tipo == 'proporcao':
+            proporcoes = (contagens / contagens.sum()).rename('proportion')
+            print(proporcoes.mul(100).round(2).astype(str) + ' %')
+
+
+def ordem_de_aparicao(df, coluna):
+    # colunas categóricas: o seaborn seguiria a ordem dos códigos; antes elas eram texto e valia a ordem
+    # em que cada resposta aparece nos dados, que é a mantida aqui para os gráficos não mudarem
+    if not isinstance(df[coluna].dtype, pd.CategoricalDtype):
+        return None
+    return list(df[coluna].dropna().unique())
+
+
+def ordenar_contagens(contagens, ordem):
+    if ordem == 'frequencia':
+        return contagens
+    if ordem is None or ordem == 'indice':
+        return contagens.sort_index()
+    return contagens.reindex(ordem, fill_value=0)
+
+
+def rotular(spec):
+    fonte_titulo = {'fontsize': spec['titulo_fontsize']} if 'titulo_fontsize' in spec else {}
+    fonte_rotulo = {'fontsize': spec['rotulo_fontsize']} if 'rotulo_fontsize' in spec else {}
+    plt.title(spec['titulo'], **fonte_titulo)
+    plt.xlabel(spec.get('xlabel', ''), **fonte_rotulo)
+    plt.ylabel(spec.get('ylabel', ''), **fonte_rotulo)
+    if spec.get('grade'):
+        plt.grid(axis='y', linestyle='--', alpha=0.7)
+    if spec.get('tight'):
+        plt.tight_layout()
+
+
+def limpar_eixos(ax):
+    # só a API pública: o clear() devolve títulos, rótulos, unidades das categorias e legendas ao padrão
+    ax.clear()
+
+
+def figura_modelo(spec, figsize, orientacao=None):
+    # a grade de rotular() muda o estilo das linhas de vez; gráficos com e sem grade não dividem figura
+    estilo = repr((sns.axes_style(), sns.plotting_context()))
+    chave = (spec['tipo'], orientacao, tuple(figsize), bool(spec.get('grade')), estilo)
+    figura, margens = _modelos.get(chave, (None, None))
+    # o número de uma figura fechada (ex.: pelo plt.close('all') do servidor) volta a ser usado por outra
+    if figura is not None and plt.fignum_exists(figura.number) and plt.figure(figura.number) is figura:
+        figura.subplots_adjust(**margens)
+        limpar_eixos(figura.axes[0])
+        return figura
+    figura = plt.figure(figsize=figsize)
+    figura.add_subplot(111)
+    _modelos[chave] = (figura, {nome: getattr(figura.subplotpars, nome)
+                                for nome in ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')})
+    return figura
+
+
+def desenhar_histograma(df, spec, agregados):
+    plt.figure(figsize=spec.get('figsize', (10, 6)))
+    histograma = agregados.get(spec['coluna'], {}).get('histograma')
+    if histograma is None:
+        sns.histplot(df[spec['coluna']].dropna(), kde=True, bins=spec.get('bins', 'auto'), color=spec.get('cor'))
+    else:
+        # modo em blocos: desenha direto das contagens de bordas fixas, recortadas à faixa ocupada
+        bordas, contagens = histograma['bordas'], histograma['contagens']
+        ocupados = np.nonzero(contagens)[0]
+        inicio, fim = (ocupados[0], ocupados[-1] + 1) if ocupados.size else (0, len(contagens))
+        intervalos = pd.DataFrame({spec['coluna']: (bordas[inicio:fim] + bordas[inicio + 1:fim + 1]) / 2,
+                                   'contagem': contagens[inicio:fim]})
+        sns.histplot(data=intervalos, x=spec['coluna'], weights='contagem', bins=list(bordas[inicio:fim + 1]),
+                     kde=True, color=spec.get('cor'))
+    rotular(spec)
+
+
+def desenhar_pizza(df, spec, agregados):
+    figura_modelo(spec, spec.get('figsize', (8, 8)))
+    contagens = contagens_da_coluna(df, spec['coluna'], agregados)
+    # categorias sem respostas não viram fatias de 0%
+    contagens = contagens[contagens > 0]
+    contagens.plot.pie(autopct='%1.1f%%', startangle=90, colors=spec.get('cores'),
+                       wedgeprops=spec.get('wedgeprops'), textprops=spec.get('textprops'))
+    rotular(spec)
+
+
+def desenhar_contagem(df, spec, agregados):
+    eixo = 'y' if 'y' in spec else 'x'
+    figura_modelo(spec, spec.get('figsize', (10, 6)), eixo)
+    coluna = spec[eixo]
+    if 'hue' in spec and spec['hue'] != coluna:
+        # contagem cruzada (ex.: dispositivo por sexo) continua com o countplot
+        sns.countplot(data=df, **{eixo: coluna}, hue=spec['hue'], palette=spec.get('paleta'),
+                      order=spec.get('ordem') or ordem_de_aparicao(df, coluna),
+                      hue_order=ordem_de_aparicao(df, spec['hue']))
+        rotular(spec)
+        return
+
+    # barras desenhadas direto da tabela de frequências já agregada
+    contagens = ordenar_contagens(contagens_da_coluna(df, coluna, agregados), spec.get('ordem'))
+    rotulos = contagens.index.astype(str)
+    valor = 'x' if eixo == 'y' else 'y'
+    opcoes = {}
+    if 'hue' in spec or 'paleta' in spec:
+        # cores seguem a ordem das categorias, como no countplot, e não a ordem das barras
+        ordem_cores = ordem_de_aparicao(df, coluna) or list(contagens.sort_index().index.astype(str))
+        opcoes = dict(hue=rotulos, hue_order=ordem_cores, palette=spec.get('paleta'), legend=False)
+    sns.barplot(**{eixo: rotulos, valor: contagens.to_numpy()}, order=list(rotulos), **opcoes)
+    rotular(spec)
+
+
+def desenhar_caixas(ax, resumo, spec, prefixo=(), tamanho_outlier=None, ordem=None):
+    # mesmo desenho do sns.boxplot (ax.bxp com as cores e larguras do seaborn),
+    # mas a partir das caixas já resumidas no cubo, sem as linhas da tabela
+    niveis = list(spec.get('ordem') or ordem or resumo['niveis'][-1])
+    cores = [sns.desaturate(cor, .75) for cor in sns.color_palette(spec.get('paleta'), len(niveis))]
+    luminosidade = min(colorsys.rgb_to_hls(*cor)[1] for cor in np.unique(cores, axis=0)) * .6
+    cor_linha = (luminosidade, luminosidade, luminosidade)
+    for posicao, (nivel, cor) in enumerate(zip(niveis, cores)):
+        caixa = resumo['resumos'].get(prefixo + (nivel,))
+        if caixa is None:
+            continue
+        ax.bxp([caixa], positions=[posicao], widths=[.8], capwidths=[.4], patch_artist=True, manage_ticks=False,
+               boxprops={'facecolor': cor, 'edgecolor': cor_linha},
+               medianprops={'color': cor_linha, 'solid_capstyle': 'butt'},
+               whiskerprops={'color': cor_linha, 'solid_capstyle': 'butt'},
+               flierprops={'markeredgecolor': cor_linha, 'markersize': tamanho_outlier},
+               capprops={'color': cor_linha})
+    ax.set_xticks(range(len(niveis)), [str(nivel) for nivel in niveis])
+    ax.xaxis.grid(False)
+    ax.set_xlim(-.5, len(niveis) - .5)
+
+
+def caixas_do_grafico(spec, agregados):
+    return agregados.get(spec['y'], {}).get('caixas', {}).get(dimensoes_do_grafico(spec))
+
+
+def desenhar_boxplot(df, spec, agregados):
+    plt.figure(figsize=spec.get('figsize', (10, 7)))
+    resumo = caixas_do_grafico(spec, agregados)
+    ordem = spec.get('ordem') or ordem_de_aparicao(df, spec['x'])
+    if resumo is None:
+        sns.boxplot(x=spec['x'], y=spec['y'], data=df, palette=spec.get('paleta'), order=ordem)
+    else:
+        desenhar_caixas(plt.gca(), resumo, spec, ordem=ordem)
+    rotular(spec)
+
+
+def desenhar_violino(df, spec, agregados):
+    plt.figure(figsize=spec.get('figsize', (12, 8)))
+    # hue categórico faz o seaborn abrir espaço para as categorias vizinhas e estreitar os violinos
+    ordem = ordem_de_aparicao(df, spec['x'])
+    sns.violinplot(x=spec['x'], y=spec['y'], data=df, hue=spec['x'], palette=spec.get('paleta'),
+                   order=ordem, hue_order=ordem, dodge=False, legend=False, inner='quartile')
+    rotular(spec)
+
+
+def desenhar_regressao(df, spec, agregados):
+    plt.figure(figsize=spec.get('figsize', (12, 8)))
+    sns.regplot(x=spec['x'], y=spec['y'], data=df, line_kws={'color': 'blue'}, scatter_kws={'alpha': 0.5})
+    rotular(spec)
+
+
+def desenhar_dispersao(df, spec, agregados):
+    plt.figure(figsize=spec.get('figsize', (12, 8)))
+    sns.scatterplot(x=spec['x'], y=spec['y'], hue=spec.get('hue'), data=df, palette=spec.get('paleta'))
+    rotular(spec)
+
+
+def desenhar_heatmap_correlacao(df, spec, agregados):
+    metodo = spec.get('metodo', 'pearson')
+    correlacoes = agregados.get(spec['variaveis'][0], {}).get('correlacao')
+    if correlacoes is None:
+        matriz = df[spec['variaveis']].corr(method=metodo)
+    else:
+        matriz = correlacoes[metodo].loc[spec['variaveis'], spec['variaveis']]
+    if 'nomes' in spec:
+        matriz.columns = spec['nomes']
+        matriz.index = spec['nomes']
+    plt.figure(figsize=spec.get('figsize', (10, 8)))
+    sns.heatmap(matriz, annot=True, cmap=spec.get('paleta'), fmt=".2f", annot_kws=spec.get('annot_kws'))
+    rotular(spec)
+
+
+def desenhar_empilhado(df, spec, agregados):
+    # como texto, o crosstab põe linhas e colunas em ordem alfabética
+    pd.crosstab(df[spec['x']].astype(object), df[spec['hue']].astype(object)).plot(kind='bar', stacked=True, colormap=spec.get('paleta'),
+                                                     figsize=spec.get('figsize', (10, 7)))
+    rotular(spec)
+    plt.xticks(rotation=0)
+
+
+def desenhar_catplot_box(df, spec, agregados):
+    resumo = caixas_do_grafico(spec, agregados)
+    ordem_linhas, ordem_colunas = ordem_de_aparicao(df, spec['row']), ordem_de_aparicao(df, spec['col'])
+    if resumo is None:
+        g = sns.catplot(data=df, x=spec['x'], y=spec['y'], col=spec['col'], row=spec['row'], kind='box',
+                        palette=spec.get('paleta'), height=5, aspect=1.2, order=spec.get('ordem'), sharey=True,
+                        row_order=ordem_linhas, col_order=ordem_colunas)
+    else:
+        # a grade só precisa das combinações de linha x coluna; as caixas vêm do cubo
+        niveis_linha, niveis_coluna = ordem_linhas or resumo['niveis'][0], ordem_colunas or resumo['niveis'][1]
+        celulas = pd.DataFrame([(a, b) for a in niveis_linha for b in niveis_coluna], columns=[spec['row'], spec['col']])
+        g = sns.FacetGrid(celulas, row=spec['row'], col=spec['col'], row_order=niveis_linha, col_order=niveis_coluna,
+                          height=5, aspect=1.2, sharey=True)
+        for (linha, coluna), ax in g.axes_dict.items():
+            desenhar_caixas(ax, resumo, spec, prefixo=(linha, coluna), tamanho_outlier=5)
+        g.set_axis_labels(spec['x'], spec['y'])
+        g.set_titles()
+        g.tight_layout()
+    g.fig.suptitle(spec['titulo'], y=1.03, fontsize=16)
+    g.set_axis_labels(spec['xlabel'], spec['ylabel'])
+    g.set_titles(col_template="{col_name}", row_template="{row_name}")
+
+
+def desenhar_ranking_sim(df, spec, agregados):
+    atividades_counts = {}
+    for col in spec['variaveis']:
+        atividades_counts[col.replace('usa_internet_', '').replace('_', ' ').capitalize()] = contagens_da_coluna(df, col, agregados).get('Sim', 0)
+    atividades_df = pd.DataFrame(list(atividades_counts.items()), columns=['Atividade', 'Contagem de "Sim"']).sort_values(by='Contagem de "Sim"', ascending=False)
+    plt.figure(figsize=spec.get('figsize', (12, 8)))
+    sns.barplot(x='Contagem de "Sim"', y='Atividade', data=atividades_df, hue='Atividade', palette=spec.get('paleta'), dodge=False, legend=False)
+    rotular(spec)
+
+
+def formatar_porcentagem(valor, _):
+    # fora da função de desenho para a figura poder ir em pickle para o PDF
+    return f'{valor:.0%}'
+
+
+def desenhar_proporcao_grupo(df, spec, agregados):
+    # proporção de "Sim" por grupo sai da matriz de finalidades, sem lambda por grupo
+    tabela = proporcoes_por_grupo(df, spec['grupo'], spec['variaveis'])
+    proporcoes = pd.DataFrame({
+        'Finalidade': np.repeat(tabela.columns.to_numpy(), len(tabela.index)),
+        'Grupo': np.tile(tabela.index.astype(str).str.capitalize().to_numpy(), len(tabela.columns)),
+        'Proporção': tabela.to_numpy().T.ravel(),
+    })
+
+    plt.figure(figsize=spec.get('figsize', (14, 8)))
+    sns.barplot(x='Finalidade', y='Proporção', hue='Grupo', data=proporcoes, palette=spec.get('paleta'))
+    plt.legend(title='Finalidade')
+    plt.gca().yaxis.set_major_formatter(plt.FuncFormatter(formatar_porcentagem))
+    rotular(spec)
+
+
+TIPOS = {
+    'histograma': desenhar_histograma,
+    'pizza': desenhar_pizza,
+    'contagem': desenhar_contagem,
+    'boxplot': desenhar_boxplot,
+    'violino': desenhar_violino,
+    'regressao': desenhar_regressao,
+    'dispersao': desenhar_dispersao,
+    'heatmap_correlacao': desenhar_heatmap_correlacao,
+    'empilhado': desenhar_empilhado,
+    'catplot_box': desenhar_catplot_box,
+    'ranking_sim': desenhar_ranking_sim,
+    'proporcao_grupo': desenhar_proporcao_grupo,
+}
+
+
+def fechar_figura():
+    if not any(plt.gcf() is figura for figura, _ in _modelos.values()):
+        plt.close()
+
+
+def save_and_close(pasta, filename, dpi=DPI_FINAL):
+    plt.savefig(os.path.join(pasta, filename), dpi=dpi, bbox_inches='tight')
+    fechar_figura()
+
+
+def desenhar_em_bytes(df, spec, agregados=None, formato='png', dpi=100):
+    try:
+        TIPOS[spec['tipo']](df, spec, agregados or {})
+        buffer = io.BytesIO()
+        plt.savefig(buffer, format=formato, dpi=dpi, bbox_inches='tight')
+    finally:
+        # um desenho que falha no meio não pode deixar a figura aberta para o próximo pedido
+        plt.close('all')
+    return buffer.getvalue()
+
+
+def desenhar_pagina(df, spec, agregados=None, formato='html'):
+    # página do documento único (documento.py). No HTML, o SVG já sai pronto do worker, com o texto como
+    # texto nas fontes da própria página; o PDF é um arquivo só, então a figura volta em pickle para o
+    # processo principal gravá-la
+    agregados = agregados or {}
+    imprimir_estatisticas(df, spec, agregados)
+    with etapa(f"Gráfico {spec['id']} ({spec.get('rotulo', spec['titulo'])})", 'grafico'):
+        TIPOS[spec['tipo']](df, spec, agregados)
+        if formato == 'html':
+            buffer = io.StringIO()
+            with plt.rc_context({'svg.fonttype': 'none'}):
+                plt.savefig(buffer, format='svg', bbox_inches='tight')
+            conteudo = buffer.getvalue()
+        else:
+            conteudo = pickle.dumps(plt.gcf())
+        fechar_figura()
+    return conteudo
+
+
+def desenhar(df, spec, pasta, agregados=None, qualidade=None):
+    # qualidade: dpi e formato das prévias; sem ela, o PNG final em 300 dpi
+    agregados = agregados or {}
+    qualidade = qualidade or {}
+    imprimir_estatisticas(df, spec, agregados)
+    with etapa(f"Gráfico {spec['id']} ({spec.get('rotulo', spec['titulo'])})", 'grafico') as medida:
+        TIPOS[spec['tipo']](df, spec, agregados)
+        save_and_close(pasta, nome_de_saida(spec['arquivo'], qualidade.get('formato')), qualidade.get('dpi', DPI_FINAL))
+    if 'rotulo' in spec:
+        print(f"Gráfico {spec['id']} ({spec['rotulo']}) gerado em {medida['segundos']:.2f} s.")
@@ -0,0 +1,124 @@
+import contextlib
+import html
+import io
+import os
+import pickle
+import re
+from datetime import datetime
+
+FORMATOS_DOCUMENTO = ('pdf', 'html')
+# Páginas de texto do PDF (A4 retrato, fonte monoespaçada)
+TAMANHO_PAGINA = (8.27, 11.69)
+LINHAS_POR_PAGINA = 90
+FONTE_TEXTO = 6.5
+# Os prints das estatísticas abrem cada tabela com '--- Título ---'
+CABECALHO_SECAO = re.compile(r'^-{3} (.+?) -{3}$')
+
+ESTILO_HTML = """
+body { font-family: 'DejaVu Sans', Arial, sans-serif; max-width: 1100px; margin: 2em auto; color: #262626; }
+section { page-break-inside: avoid; border-top: 1px solid #ddd; padding-top: 1em; }
+svg { max-width: 100%; height: auto; }
+pre { font-size: 12px; overflow-x: auto; background: #f7f7f7; padding: .6em; }
+"""
+
+
+def formato_do_documento(caminho):
+    formato = os.path.splitext(caminho)[1].lower().lstrip('.')
+    if formato not in FORMATOS_DOCUMENTO:
+        raise ValueError(f"O documento precisa terminar em .pdf ou .html, não '{caminho}'.")
+    return formato
+
+
+@contextlib.contextmanager
+def escrever_documento(caminho, titulo):
+    # cada página vai para o arquivo assim que fica pronta; no fim, só o arquivo aberto e o contador
+    # de páginas ficaram na memória
+    formato = formato_do_documento(caminho)
+    pasta = os.path.dirname(caminho)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    doc = {'caminho': caminho, 'formato': formato, 'paginas': 0}
+    if formato == 'pdf':
+        from matplotlib.backends.backend_pdf import PdfPages
+        with PdfPages(caminho, metadata={'Title': titulo}) as pdf:
+            doc['pdf'] = pdf
+            yield doc
+    else:
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            doc['arquivo'] = arquivo
+            arquivo.write(f'<!DOCTYPE html>\n<html lang="pt-BR">\n<head>\n<meta charset="utf-8">\n'
+                          f'<title>{html.escape(titulo)}</title>\n<style>{ESTILO_HTML}</style>\n</head>\n<body>\n'
+                          f'<h1>{html.escape(titulo)}</h1>\n<p>Gerado em {datetime.now():%d/%m/%Y %H:%M}.</p>\n')
+            yield doc
+            arquivo.write('</body>\n</html>\n')
+    print(f"\nDocumento '{caminho}' gravado com {doc['paginas']} páginas.")
+
+
+def adicionar_grafico(doc, spec, conteudo, texto=''):
+    # conteudo: o que desenhos.desenhar_pagina devolveu (SVG no HTML, figura em pickle no PDF)
+    if doc['formato'] == 'pdf':
+        import matplotlib.pyplot as plt
+        figura = pickle.loads(conteudo)
+        doc['pdf'].savefig(figura, bbox_inches='tight')
+        plt.close(figura)
+    else:
+        svg = conteudo[conteudo.index('<svg'):]
+        estatisticas = f'<pre>{html.escape(texto.strip())}</pre>\n' if texto.strip() else ''
+        doc['arquivo'].write(f'<section id="grafico-{spec["id"]}">\n{svg}\n{estatisticas}</section>\n')
+        doc['arquivo'].flush()
+    doc['paginas'] += 1
+
+
+def secoes_do_texto(texto):
+    # divide a saída impressa em (título, corpo) a cada cabeçalho '--- Título ---'
+    secoes = []
+    titulo, corpo = None, []
+    for linha in texto.splitlines():
+        cabecalho = CABECALHO_SECAO.match(linha.strip())
+        if cabecalho:
+            if titulo is not None or any(corpo):
+                secoes.append((titulo, '\n'.join(corpo).strip('\n')))
+            titulo, corpo = cabecalho.group(1), []
+        else:
+            corpo.append(linha)
+    if titulo is not None or any(corpo):
+        secoes.append((titulo, '\n'.join(corpo).strip('\n')))
+    return secoes
+
+
+def adicionar_texto(doc, titulo, texto):
+    if doc['formato'] == 'html':
+        cabecalho = f'<h2>{html.escape(titulo)}</h2>\n' if titulo else ''
+        doc['arquivo'].write(f'<section>\n{cabecalho}<pre>{html.escape(texto)}</pre>\n</section>\n')
+        doc['arquivo'].flush()
+        doc['paginas'] += 1
+        return
+
+    import matplotlib.pyplot as plt
+    linhas = texto.splitlines() or ['']
+    for inicio in range(0, len(linhas), LINHAS_POR_PAGINA):
+        figura = plt.figure(figsize=TAMANHO_PAGINA)
+        if titulo:
+            figura.text(0.05, 0.97, titulo if inicio == 0 else f'{titulo} (continuação)', fontsize=11,
+                        fontweight='bold', va='top')
+        figura.text(0.05, 0.94, '\n'.join(linhas[inicio:inicio + LINHAS_POR_PAGINA]), family='monospace',
+                    fontsize=FONTE_TEXTO, va='top')
+        doc['pdf'].savefig(figura)
+        plt.close(figura)
+        doc['paginas'] += 1
+
+
+def adicionar_estatisticas(doc, calcular, *args, **kwargs):
+    # roda a função que imprime as estatísticas, mostra a saída como sempre e põe cada tabela numa seção
+    saida = io.StringIO()
+    with contextlib.redirect_stdout(saida):
+        calcular(*args, **kwargs)
+    texto = saida.getvalue()
+    print(texto, end='')
+    if doc['formato'] == 'pdf':
+        # no PDF as tabelas seguem uma após a outra, em vez de uma página quase vazia para cada
+        adicionar_texto(doc, 'Cálculos Estatísticos', texto.strip('\n'))
+        return
+    for titulo, corpo in secoes_do_texto(texto):
+        if corpo:
+            adicionar_texto(doc, titulo, corpo)
@@ -0,0 +1,174 @@
+import numpy as np
+import pandas as pd
+
+from carregamento import ARQUIVO_DADOS, agregar_em_blocos
+
+COLUNAS_QUANTITATIVAS = ['idade', 'renda_familiar', 'tempo_conectado_diario', 'tempo_estudo_diario', 'tempo_estudo_internet']
+
+# Bordas fixas para os histogramas em blocos: precisam ser conhecidas antes de ler o arquivo.
+# Valores fora da faixa caem no primeiro/último intervalo.
+BORDAS_HISTOGRAMA = {
+    'idade': np.arange(10, 81, 1.0),
+    'renda_familiar': np.arange(0, 50001, 250.0),
+    'tempo_conectado_diario': np.arange(0, 24.5, 0.5),
+    'tempo_estudo_diario': np.arange(0, 24.5, 0.5),
+    'tempo_estudo_internet': np.arange(0, 24.5, 0.5),
+}
+
+K_SKETCH = 400
+SEMENTE_SKETCH = 0
+
+
+def valores_validos(serie):
+    valores = serie.to_numpy(dtype='float64', na_value=np.nan)
+    return valores[~np.isnan(valores)]
+
+
+# --- média e variância (Welford / Chan) ---
+
+def momentos_de(valores):
+    if valores.size == 0:
+        return {'n': 0, 'media': 0.0, 'm2': 0.0, 'min': np.inf, 'max': -np.inf}
+    media = valores.mean()
+    return {'n': valores.size, 'media': media, 'm2': ((valores - media) ** 2).sum(),
+            'min': valores.min(), 'max': valores.max()}
+
+
+def combinar_momentos(a, b):
+    n = a['n'] + b['n']
+    if n == 0:
+        return dict(a)
+    delta = b['media'] - a['media']
+    return {'n': n,
+            'media': a['media'] + delta * b['n'] / n,
+            'm2': a['m2'] + b['m2'] + delta ** 2 * a['n'] * b['n'] / n,
+            'min': min(a['min'], b['min']), 'max': max(a['max'], b['max'])}
+
+
+def desvio_padrao(momentos):
+    return np.sqrt(momentos['m2'] / (momentos['n'] - 1)) if momentos['n'] > 1 else np.nan
+
+
+# --- quantis (sketch KLL) ---
+
+def _capacidade(nivel, n_niveis, k):
+    return max(2, int(np.ceil(k * (2 / 3) ** (n_niveis - 1 - nivel))))
+
+
+def _compactar(sketch):
+    # compactação preguiçosa: só compacta enquanto o sketch inteiro passar da capacidade total,
+    # sempre pelo nível mais baixo que estiver acima da sua capacidade
+    niveis, k = sketch['niveis'], sketch['k']
+    while sum(len(nivel) for nivel in niveis) > sum(_capacidade(h, len(niveis), k) for h in range(len(niveis))):
+        h = next(h for h in range(len(niveis)) if len(niveis[h]) > _capacidade(h, len(niveis), k))
+        itens = np.sort(niveis[h])
+        sobra = itens[:0]
+        if len(itens) % 2:
+            sobra, itens = itens[-1:], itens[:-1]
+        # metade dos itens sobe de nível com o dobro do peso
+        promovidos = itens[sketch['rng'].integers(2)::2]
+        if h + 1 == len(niveis):
+            niveis.append(promovidos[:0])
+        niveis[h + 1] = np.concatenate([niveis[h + 1], promovidos])
+        niveis[h] = sobra
+    return sketch
+
+
+def novo_sketch(k, n, niveis, semente):
+    # cada sketch sorteia com o seu gerador: o resultado não depende de quantos sketches rodaram antes
+    return {'k': k, 'n': n, 'niveis': niveis, 'semente': semente, 'rng': np.random.default_rng(semente)}
+
+
+def sketch_de(valores, k=K_SKETCH, semente=SEMENTE_SKETCH):
+    return _compactar(novo_sketch(k, valores.size, [np.asarray(valores, dtype='float64')], semente))
+
+
+def combinar_sketches(a, b):
+    n_niveis = max(len(a['niveis']), len(b['niveis']))
+    vazio = np.empty(0)
+    niveis = [np.concatenate([a['niveis'][h] if h < len(a['niveis']) else vazio,
+                              b['niveis'][h] if h < len(b['niveis']) else vazio]) for h in range(n_niveis)]
+    # a semente do combinado sai só das sementes das partes, então a mesma junção dá sempre o mesmo sketch
+    semente = int(np.random.SeedSequence([a['semente'], b['semente']]).generate_state(1)[0])
+    return _compactar(novo_sketch(a['k'], a['n'] + b['n'], niveis, semente))
+
+
+def quantis(sketch, qs):
+    qs = np.atleast_1d(qs)
+    if len(sketch['niveis']) == 1:
+        # nada foi compactado ainda: quantil exato, igual ao pandas
+        return np.quantile(sketch['niveis'][0], qs) if sketch['n'] else np.full(len(qs), np.nan)
+    itens = np.concatenate(sketch['niveis'])
+    pesos = np.concatenate([np.full(len(nivel), 2 ** h) for h, nivel in enumerate(sketch['niveis'])])
+    ordem = np.argsort(itens)
+    itens, acumulado = itens[ordem], np.cumsum(pesos[ordem])
+    posicoes = np.searchsorted(acumulado, qs * acumulado[-1], side='left')
+    return itens[np.minimum(posicoes, len(itens) - 1)]
+
+
+# --- histogramas de bordas fixas ---
+
+def histograma_de(valores, bordas):
+    valores = np.clip(valores, bordas[0], bordas[-1])
+    contagens, _ = np.histogram(valores, bins=bordas)
+    return {'bordas': bordas, 'contagens': contagens}
+
+
+def combinar_histogramas(a, b):
+    return {'bordas': a['bordas'], 'contagens': a['contagens'] + b['contagens']}
+
+
+# --- estado por coluna, atualizado bloco a bloco ---
+
+def estado_de(serie, coluna, k=K_SKETCH):
+    valores = valores_validos(serie)
+    estado = {'momentos': momentos_de(valores), 'sketch': sketch_de(valores, k)}
+    if coluna in BORDAS_HISTOGRAMA:
+        estado['histograma'] = histograma_de(valores, BORDAS_HISTOGRAMA[coluna])
+    return estado
+
+
+def combinar_estados(a, b):
+    estado = {'momentos': combinar_momentos(a['momentos'], b['momentos']),
+              'sketch': combinar_sketches(a['sketch'], b['sketch'])}
+    if 'histograma' in a:
+        estado['histograma'] = combinar_histogramas(a['histograma'], b['histograma'])
+    return estado
+
+
+def estados_de_bloco(bloco, colunas):
+    return {col: estado_de(bloco[col], col) for col in colunas if col in bloco.columns}
+
+
+def combinar_estados_por_coluna(a, b):
+    return {col: combinar_estados(a[col], b[col]) if col in b else a[col] for col in a}
+
+
+def estatisticas_em_blocos(caminho=ARQUIVO_DADOS, colunas=COLUNAS_QUANTITATIVAS, **kwargs):
+    return agregar_em_blocos(lambda bloco: estados_de_bloco(bloco, colunas), combinar_estados_por_coluna,
+                             caminho, **kwargs)
+
+
+def resumo_de_estado(estado, nome):
+    momentos = estado['momentos']
+    q1, mediana, q3 = quantis(estado['sketch'], [0.25, 0.5, 0.75])
+    return pd.Series([float(momentos['n']), momentos['media'], desvio_padrao(momentos), momentos['min'],
+                      q1, mediana, q3, momentos['max']],
+                     index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'], name=nome)
+
+
+def tabela_descritiva(estados, colunas):
+    linhas = {col: {'mean': estados[col]['momentos']['media'],
+                    'median': quantis(estados[col]['sketch'], 0.5)[0],
+                    'std': desvio_padrao(estados[col]['momentos'])}
+              for col in colunas if col in estados}
+    return pd.DataFrame.from_dict(linhas, orient='index', columns=['mean', 'median', 'std'])
+
+
+def agregados_de_estados(estados):
+    agregados = {}
+    for col, estado in estados.items():
+        agregados[col] = {'resumo': resumo_de_estado(estado, col)}
+        if 'histograma' in estado:
+            agregados[col]['histograma'] = estado['histograma']
+    return agregados
@@ -0,0 +1,161 @@
+import contextlib
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+MODOS_PERFIL = ('cprofile', 'tracemalloc')
+ARQUIVO_PERFIL = 'perfil.prof'
+TOP_N = 10
+INTERVALO_AMOSTRAGEM = 0.002
+
+# medições do processo: dicts com categoria, nome, segundos e pico_mb
+_medicoes = []
+_abertas = []
+_estado = {'modo': None, 'perfil': None}
+
+
+def rss_atual():
+    # memória residente do processo (Linux); o tracemalloc deixaria as etapas até 10x mais lentas
+    # e não enxerga o que o pyarrow e o parser de CSV alocam em C
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+@contextlib.contextmanager
+def pico_de_memoria(medida):
+    # uma thread amostra a memória residente enquanto a etapa roda; o pico guardado é o acréscimo
+    # sobre a memória do início da etapa
+    inicial = rss_atual()
+    pico = [inicial]
+    parar = threading.Event()
+
+    def amostrar():
+        while not parar.wait(INTERVALO_AMOSTRAGEM):
+            pico[0] = max(pico[0], rss_atual())
+
+    if inicial is not None:
+        amostrador = threading.Thread(target=amostrar, daemon=True)
+        amostrador.start()
+    try:
+        yield
+    finally:
+        if inicial is not None:
+            parar.set()
+            amostrador.join()
+            pico[0] = max(pico[0], rss_atual())
+            medida['pico_mb'] = round((pico[0] - inicial) / 2 ** 20, 3)
+        else:
+            medida['pico_mb'] = None
+
+
+@contextlib.contextmanager
+def pico_tracemalloc(medida):
+    # o pico do tracemalloc é global: antes de zerá-lo, ele é repassado às etapas ainda abertas
+    for aberta in _abertas:
+        aberta['_pico'] = max(aberta['_pico'], tracemalloc.get_traced_memory()[1])
+    tracemalloc.reset_peak()
+    medida['_inicio'] = medida['_pico'] = tracemalloc.get_traced_memory()[0]
+    _abertas.append(medida)
+    try:
+        yield
+    finally:
+        _abertas.remove(medida)
+        pico = tracemalloc.get_traced_memory()[1]
+        for aberta in _abertas + [medida]:
+            aberta['_pico'] = max(aberta['_pico'], pico)
+        medida['pico_mb'] = round((medida.pop('_pico') - medida.pop('_inicio')) / 2 ** 20, 3)
+
+
+@contextlib.contextmanager
+def etapa(nome, categoria='etapa'):
+    medida = {'categoria': categoria, 'nome': nome}
+    memoria = pico_tracemalloc if _estado['modo'] == 'tracemalloc' else pico_de_memoria
+    with memoria(medida):
+        inicio = time.perf_counter()
+        try:
+            yield medida
+        finally:
+            medida['segundos'] = time.perf_counter() - inicio
+    _medicoes.append(medida)
+
+
+@contextlib.contextmanager
+def capturar():
+    # medições feitas dentro do bloco, retiradas da lista para voltar ao processo principal
+    inicio = len(_medicoes)
+    capturadas = []
+    try:
+        yield capturadas
+    finally:
+        capturadas.extend(_medicoes[inicio:])
+        del _medicoes[inicio:]
+
+
+def registrar(medicoes):
+    _medicoes.extend(medicoes)
+
+
+def iniciar(modo=None):
+    _medicoes.clear()
+    _estado['modo'] = modo
+    if modo == 'cprofile':
+        _estado['perfil'] = cProfile.Profile()
+        _estado['perfil'].enable()
+    elif modo == 'tracemalloc':
+        tracemalloc.start()
+
+
+def resumir(categorias=None):
+    # etapas repetidas (ex.: a limpeza de cada bloco) somam o tempo e ficam com o maior pico
+    resumo = {}
+    for medida in _medicoes:
+        if categorias is not None and medida['categoria'] not in categorias:
+            continue
+        chave = (medida['categoria'], medida['nome'])
+        total = resumo.setdefault(chave, {'categoria': chave[0], 'nome': chave[1], 'vezes': 0, 'segundos': 0.0,
+                                          'pico_mb': None})
+        total['vezes'] += 1
+        total['segundos'] += medida['segundos']
+        if medida['pico_mb'] is not None:
+            total['pico_mb'] = max(total['pico_mb'] or 0.0, medida['pico_mb'])
+    return sorted(resumo.values(), key=lambda total: total['segundos'], reverse=True)
+
+
+def imprimir_tabela(titulo, linhas, top):
+    if not linhas:
+        return
+    print(f"\n--- {titulo} (top {min(top, len(linhas))} de {len(linhas)}) ---")
+    print(f"{'etapa':<52} {'vezes':>5} {'tempo (s)':>10} {'pico (MB)':>10}")
+    for linha in linhas[:top]:
+        pico = f"{linha['pico_mb']:10.1f}" if linha['pico_mb'] is not None else f"{'-':>10}"
+        print(f"{linha['nome'][:52]:<52} {linha['vezes']:>5} {linha['segundos']:>10.3f} {pico}")
+
+
+def finalizar(top=TOP_N):
+    imprimir_tabela('Etapas mais lentas', resumir(categorias={'etapa', 'carregamento', 'agregacao', 'estatistica'}), top)
+    imprimir_tabela('Gráficos mais lentos', resumir(categorias={'grafico'}), top)
+
+    if _estado['modo'] == 'cprofile':
+        _estado['perfil'].disable()
+        _estado['perfil'].dump_stats(ARQUIVO_PERFIL)
+        texto = io.StringIO()
+        pstats.Stats(_estado['perfil'], stream=texto).sort_stats('cumulative').print_stats(top)
+        print(f"\n--- cProfile: funções com maior tempo acumulado (perfil completo em '{ARQUIVO_PERFIL}') ---")
+        print(texto.getvalue().strip())
+    elif _estado['modo'] == 'tracemalloc':
+        # as importações preguiçosas também alocam durante a execução; ficam fora da lista
+        sem_importacao = [tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+                          tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>')]
+        estatisticas = tracemalloc.take_snapshot().filter_traces(sem_importacao).statistics('lineno')
+        tracemalloc.stop()
+        print("\n--- tracemalloc: linhas com mais memória ainda alocada no fim ---")
+        for estatistica in estatisticas[:top]:
+            print(estatistica)
+    _estado['modo'] = _estado['perfil'] = None
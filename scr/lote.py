@@ -0,0 +1,107 @@
+import argparse
+import contextlib
+import glob
+import hashlib
+import os
+
+import instrumentacao
+from instrumentacao import etapa
+from opcoes import adicionar_opcoes_graficos
+
+PASTA_LOTE = 'relatorios_lote'
+PASTA_COMBINADO = 'combinado'
+# Coluna acrescentada ao relatório combinado com o arquivo de origem de cada aluno
+COLUNA_ORIGEM = 'origem'
+
+
+def nome_do_arquivo(caminho):
+    return os.path.splitext(os.path.basename(caminho))[0]
+
+
+def relatorio_do_arquivo(df, pasta, fonte, args):
+    from catalogo import GRAFICOS_ANALISE
+    from main import calculos_estatisticos, tema
+    from registro import executar_graficos
+
+    print(f"\n=== {len(df)} alunos, relatório em '{pasta}' ===")
+    executar_graficos(df, GRAFICOS_ANALISE, pasta, somente=args.only, workers=args.workers, tema=tema,
+                      incremental=not args.forcar, fonte=fonte)
+    if args.only is None:
+        with open(os.path.join(pasta, 'relatorio.txt'), 'w', encoding='utf-8') as saida:
+            with contextlib.redirect_stdout(saida):
+                calculos_estatisticos(df, pasta=pasta)
+
+
+def dados_combinados(partes, fontes):
+    # o combinado também vai para um feather, para os workers o mapearem como fazem com cada arquivo
+    import pandas as pd
+    from cache import PASTA_CACHE, gravar_cache, ler_cache
+
+    chave = hashlib.blake2b(repr(sorted(fontes)).encode('utf-8'), digest_size=16).hexdigest()
+    arquivo = os.path.join(PASTA_CACHE, f'lote-{chave}.feather')
+    if os.path.exists(arquivo):
+        return ler_cache(arquivo), arquivo
+    with etapa('Junção dos arquivos', 'carregamento'):
+        combinado = pd.concat([df.assign(**{COLUNA_ORIGEM: nome}) for nome, df in partes], ignore_index=True)
+        combinado[COLUNA_ORIGEM] = combinado[COLUNA_ORIGEM].astype(
+            pd.CategoricalDtype([nome for nome, _ in partes]))
+    for antigo in glob.glob(os.path.join(PASTA_CACHE, 'lote-' + '?' * len(chave) + '.feather')):
+        os.remove(antigo)
+    gravar_cache(combinado, arquivo)
+    return combinado, arquivo
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Relatório de vários arquivos (um por campus ou turma) e o combinado de todos, num só processo.')
+    parser.add_argument('padroes', nargs='+', help="Arquivos ou padrões glob, ex.: 'campi/*.csv'")
+    adicionar_opcoes_graficos(parser, '16,21')
+    parser.add_argument('--saida', default=PASTA_LOTE, help='Pasta dos relatórios (uma subpasta por arquivo).')
+    parser.add_argument('--sem-combinado', action='store_true', help='Não gera o relatório com todos os arquivos.')
+    args = parser.parse_args(argv)
+
+    arquivos = sorted({arquivo for padrao in args.padroes for arquivo in glob.glob(padrao)})
+    if not arquivos:
+        parser.error(f"Nenhum arquivo encontrado em {args.padroes}.")
+    from segmentos import nome_da_pasta
+
+    nomes = [nome_do_arquivo(arquivo) for arquivo in arquivos]
+    # a comparação é nas pastas, não nos nomes: 'campus-a' e 'campus a' caem na mesma pasta
+    pastas = [nome_da_pasta(nome) for nome in nomes]
+    if len(set(pastas)) < len(pastas):
+        parser.error("Dois arquivos caem na mesma pasta de relatório; as pastas se sobreporiam.")
+    if not args.sem_combinado and PASTA_COMBINADO in pastas:
+        parser.error(f"Um arquivo cai na pasta '{PASTA_COMBINADO}', reservada ao relatório combinado.")
+
+    from cache import feather, ler_cache, preparar_cache
+    from main import tema
+    from renderizacao import pool_compartilhado
+
+    if feather is None:
+        parser.error("O modo em lote precisa do pyarrow: os workers leem cada arquivo do cache feather.")
+
+    instrumentacao.iniciar()
+    # o mesmo pool lê e limpa os arquivos e depois desenha os gráficos de todos os relatórios
+    with pool_compartilhado(args.workers, tema) as executor:
+        with etapa(f'Leitura e limpeza de {len(arquivos)} arquivos em paralelo', 'carregamento'):
+            fontes = list(executor.map(preparar_cache, arquivos))
+
+        partes = []
+        for nome, pasta, fonte in zip(nomes, pastas, fontes):
+            df = ler_cache(fonte)
+            relatorio_do_arquivo(df, os.path.join(args.saida, pasta), fonte, args)
+            if not args.sem_combinado:
+                partes.append((nome, df))
+            del df
+
+        if partes:
+            combinado, fonte = dados_combinados(partes, fontes)
+            del partes
+            relatorio_do_arquivo(combinado, os.path.join(args.saida, PASTA_COMBINADO), fonte, args)
+
+    print(f"\n\nLote finalizado: {len(arquivos)} arquivos. Relatórios na pasta '{args.saida}'.")
+    instrumentacao.finalizar()
+
+
+if __name__ == '__main__':
+    main()
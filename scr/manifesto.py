@@ -0,0 +1,73 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+ARQUIVO_MANIFESTO = '.manifesto.json'
+# Incrementar quando o código de desenho mudar de forma que invalide as imagens já geradas.
+VERSAO_MANIFESTO = 4
+
+
+def hash_colunas(df, colunas):
+    hashes = {}
+    for col in colunas:
+        valores = pd.util.hash_pandas_object(df[col], index=False).to_numpy()
+        h = hashlib.blake2b(valores.tobytes(), digest_size=16)
+        h.update(str(df[col].dtype).encode('utf-8'))
+        hashes[col] = h.hexdigest()
+    return hashes
+
+
+def hash_grafico(spec, colunas, hashes_colunas, extra=None):
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps([VERSAO_MANIFESTO, spec, extra], sort_keys=True, default=str).encode('utf-8'))
+    for col in colunas:
+        h.update(col.encode('utf-8'))
+        h.update(hashes_colunas[col].encode('utf-8'))
+    return h.hexdigest()
+
+
+def chave_de_saida(hash_conteudo, qualidade=None):
+    # o manifesto guarda "conteúdo@qualidade": mudar o dpi ou o formato das prévias, ou passar da prévia
+    # para o final, também redesenha; o modo final compara só a parte do conteúdo com a das prévias
+    rotulo = f"{qualidade.get('formato') or 'png'}-{qualidade.get('dpi')}" if qualidade else 'final'
+    return f"{hash_conteudo}@{rotulo}"
+
+
+def hash_do_conteudo(chave):
+    return chave.partition('@')[0] if chave else None
+
+
+def ler_manifesto(pasta):
+    caminho = os.path.join(pasta, ARQUIVO_MANIFESTO)
+    if not os.path.exists(caminho):
+        return {}
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def gravar_manifesto(pasta, manifesto):
+    caminho = os.path.join(pasta, ARQUIVO_MANIFESTO)
+    temporario = caminho + '.tmp'
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(manifesto, f, indent=2, sort_keys=True)
+    os.replace(temporario, caminho)
+
+
+def nome_de_saida(arquivo, formato=None):
+    # as prévias em SVG trocam só a extensão; o manifesto continua indexado pelo nome do catálogo
+    return f"{os.path.splitext(arquivo)[0]}.{formato}" if formato else arquivo
+
+
+def graficos_alterados(specs, hashes, pasta, manifesto, formato=None):
+    alterados = []
+    for spec in specs:
+        arquivo = spec['arquivo']
+        if (manifesto.get(arquivo) != hashes[arquivo]
+                or not os.path.exists(os.path.join(pasta, nome_de_saida(arquivo, formato)))):
+            alterados.append(spec)
+    return alterados
@@ -0,0 +1,261 @@
+import argparse
+import json
+import os
+import pickle
+from datetime import datetime
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from cache import hash_fonte
+from carregamento import agregar_em_blocos
+from estimadores import combinar_estados, estados_de_bloco, quantis, tabela_descritiva
+from instrumentacao import etapa
+from segmentos import nome_da_pasta
+from significancia import (COLUNAS_NUMERICAS, benjamini_hochberg, colunas_categoricas, matriz_codigos,
+                           qui_quadrado_em_lote, tabelas_contingencia)
+from uso_internet import matriz_uso
+
+PASTA_ONDAS = '.ondas'
+ARQUIVO_INDICE = 'ondas.json'
+ARQUIVO_COMPARACAO = 'comparacao_ondas.csv'
+# Incrementar quando o formato do estado de uma onda mudar; estados antigos não se misturam com novos
+VERSAO_ESTADO = 2
+
+
+# --- estado de uma onda: só contagens e resumos que se somam entre blocos e entre ondas ---
+
+def estado_de_bloco(bloco):
+    categoricas = colunas_categoricas(bloco)
+    codigos, niveis = matriz_codigos(bloco, categoricas)
+    frequencias = {}
+    for j, col in enumerate(categoricas):
+        validos = codigos[:, j][codigos[:, j] >= 0]
+        frequencias[col] = pd.Series(np.bincount(validos, minlength=niveis[j]), index=bloco[col].cat.categories,
+                                     name=col)
+    pares = np.array(list(combinations(range(len(categoricas)), 2)))
+    contingencia = {}
+    if len(pares):
+        tabelas = tabelas_contingencia(codigos, niveis, pares)
+        for p, (i, j) in enumerate(pares):
+            contingencia[(categoricas[i], categoricas[j])] = tabelas[p, :niveis[i], :niveis[j]]
+    matriz, colunas_uso = matriz_uso(bloco)
+    m = matriz.astype(np.int64)
+    return {'n': len(bloco), 'frequencias': frequencias, 'contingencia': contingencia,
+            'numericas': estados_de_bloco(bloco, COLUNAS_NUMERICAS),
+            'co_uso': {'colunas': colunas_uso, 'matriz': m.T @ m,
+                       'finalidades': np.bincount(m.sum(axis=1), minlength=len(colunas_uso) + 1)}}
+
+
+def _unir(a, b, combinar):
+    return {chave: combinar(a[chave], b[chave]) if chave in a and chave in b else a.get(chave, b.get(chave))
+            for chave in {**a, **b}}
+
+
+def combinar_estados_de_onda(a, b):
+    for col in set(a['frequencias']) & set(b['frequencias']):
+        if not a['frequencias'][col].index.equals(b['frequencias'][col].index):
+            raise ValueError(f"As categorias de '{col}' mudaram entre as ondas; o layout precisa ser o mesmo.")
+    if a['co_uso']['colunas'] != b['co_uso']['colunas']:
+        raise ValueError("As colunas de uso da internet mudaram entre as ondas; o layout precisa ser o mesmo.")
+    return {'n': a['n'] + b['n'],
+            'frequencias': _unir(a['frequencias'], b['frequencias'], lambda x, y: x.add(y).astype('int64')),
+            'contingencia': _unir(a['contingencia'], b['contingencia'], np.add),
+            'numericas': _unir(a['numericas'], b['numericas'], combinar_estados),
+            'co_uso': {'colunas': a['co_uso']['colunas'], 'matriz': a['co_uso']['matriz'] + b['co_uso']['matriz'],
+                       'finalidades': a['co_uso']['finalidades'] + b['co_uso']['finalidades']}}
+
+
+# --- persistência: um arquivo por onda, o total acumulado e um índice ---
+
+def ler_indice(pasta=PASTA_ONDAS):
+    caminho = os.path.join(pasta, ARQUIVO_INDICE)
+    if not os.path.exists(caminho):
+        return {'versao': VERSAO_ESTADO, 'total': None, 'ondas': []}
+    with open(caminho, encoding='utf-8') as f:
+        indice = json.load(f)
+    if indice.get('versao') != VERSAO_ESTADO:
+        raise ValueError(f"O estado em '{pasta}' foi gravado por outra versão; apague a pasta e adicione as ondas de novo.")
+    return indice
+
+
+def _gravar(caminho, escrever):
+    temporario = caminho + '.tmp'
+    with open(temporario, 'wb') as f:
+        escrever(f)
+    os.replace(temporario, caminho)
+
+
+def gravar_indice(indice, pasta=PASTA_ONDAS):
+    _gravar(os.path.join(pasta, ARQUIVO_INDICE),
+            lambda f: f.write(json.dumps(indice, indent=2, ensure_ascii=False).encode('utf-8')))
+
+
+def ler_estado(pasta, arquivo):
+    with open(os.path.join(pasta, arquivo), 'rb') as f:
+        return pickle.load(f)
+
+
+def gravar_estado(pasta, arquivo, estado):
+    _gravar(os.path.join(pasta, arquivo), lambda f: pickle.dump(estado, f, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def adicionar_onda(caminho, nome=None, pasta=PASTA_ONDAS):
+    # custo proporcional à onda nova: ela é lida em blocos e o total só é somado ao estado dela
+    indice = ler_indice(pasta)
+    nome = nome or os.path.splitext(os.path.basename(caminho))[0]
+    chave = hash_fonte(caminho)
+    repetida = next((onda for onda in indice['ondas'] if onda['hash'] == chave), None)
+    if repetida:
+        print(f"'{caminho}' já foi adicionado como a onda '{repetida['nome']}'; nada a fazer.")
+        return None
+    arquivo_onda = f"onda-{nome_da_pasta(nome)}.pkl"
+    if any(onda['nome'] == nome or onda['estado'] == arquivo_onda for onda in indice['ondas']):
+        raise ValueError(f"Já existe uma onda chamada '{nome}'; use --nome para escolher outro.")
+
+    with etapa(f"Onda '{nome}' (leitura e agregação)", 'carregamento'):
+        estado = agregar_em_blocos(estado_de_bloco, combinar_estados_de_onda, caminho)
+    os.makedirs(pasta, exist_ok=True)
+    gravar_estado(pasta, arquivo_onda, estado)
+
+    # o total novo ganha outro nome e só passa a valer quando o índice é gravado: se a execução
+    # cair no meio, o índice continua apontando para o total antigo, sem contar a onda duas vezes
+    total_antigo = indice['total']
+    total = combinar_estados_de_onda(ler_estado(pasta, total_antigo), estado) if total_antigo else estado
+    indice['total'] = f"total-{len(indice['ondas']) + 1:04d}.pkl"
+    gravar_estado(pasta, indice['total'], total)
+    indice['ondas'].append({'nome': nome, 'arquivo': os.path.abspath(caminho), 'hash': chave,
+                            'estado': arquivo_onda, 'linhas': estado['n'],
+                            'adicionada_em': datetime.now().isoformat(timespec='seconds')})
+    gravar_indice(indice, pasta)
+    if total_antigo:
+        os.remove(os.path.join(pasta, total_antigo))
+    print(f"Onda '{nome}' adicionada: {estado['n']} alunos (total acumulado: {total['n']}).")
+    return estado
+
+
+# --- relatórios a partir dos estados, sem reler nenhuma resposta ---
+
+def testes_do_total(total):
+    pares = list(total['contingencia'])
+    if not pares:
+        return pd.DataFrame()
+    n_max = max(max(tabela.shape) for tabela in total['contingencia'].values())
+    tabelas = np.zeros((len(pares), n_max, n_max), dtype=np.int64)
+    for p, par in enumerate(pares):
+        tabela = total['contingencia'][par]
+        tabelas[p, :tabela.shape[0], :tabela.shape[1]] = tabela
+    qui2, gl, p_valor, v_cramer, n = qui_quadrado_em_lote(tabelas)
+    resultados = pd.DataFrame({'teste': 'qui-quadrado', 'variavel_1': [a for a, _ in pares],
+                               'variavel_2': [b for _, b in pares], 'estatistica': qui2, 'gl': gl,
+                               'p_valor': p_valor, 'efeito': v_cramer, 'n': n.astype(np.int64)})
+    resultados['p_ajustado'] = benjamini_hochberg(resultados['p_valor'])
+    return resultados.sort_values(['p_ajustado', 'p_valor'], kind='stable').reset_index(drop=True)
+
+
+def comparar_ondas(estados):
+    # as categóricas comparam a distribuição entre ondas (qui-quadrado onda x categoria);
+    # as numéricas, as médias (ANOVA de um fator, exata a partir de n, média e soma dos quadrados)
+    linhas = []
+    comuns = set.intersection(*(set(e['frequencias']) for e in estados))
+    for col in sorted(comuns):
+        tabela = np.stack([e['frequencias'][col].to_numpy() for e in estados])[None]
+        qui2, gl, p_valor, v_cramer, n = qui_quadrado_em_lote(tabela)
+        linhas.append(('qui-quadrado', col, qui2[0], gl[0], p_valor[0], v_cramer[0], int(n[0])))
+    comuns = set.intersection(*(set(e['numericas']) for e in estados))
+    for col in [c for c in COLUNAS_NUMERICAS if c in comuns]:
+        momentos = [e['numericas'][col]['momentos'] for e in estados if e['numericas'][col]['momentos']['n'] > 0]
+        n = np.array([m['n'] for m in momentos], dtype='float64')
+        medias = np.array([m['media'] for m in momentos])
+        total, k = n.sum(), len(momentos)
+        if k < 2 or total <= k:
+            continue
+        media_geral = (n * medias).sum() / total
+        entre = (n * (medias - media_geral) ** 2).sum()
+        dentro = sum(m['m2'] for m in momentos)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            f = (entre / (k - 1)) / (dentro / (total - k))
+        linhas.append(('anova', col, f, k - 1, stats.f.sf(f, k - 1, total - k), entre / (entre + dentro), int(total)))
+    comparacao = pd.DataFrame(linhas, columns=['teste', 'variavel', 'estatistica', 'gl', 'p_valor', 'efeito', 'n'])
+    if not comparacao.empty:
+        comparacao['p_ajustado'] = benjamini_hochberg(comparacao['p_valor'])
+    return comparacao
+
+
+def medias_por_onda(nomes, estados):
+    colunas = [c for c in COLUNAS_NUMERICAS if any(c in e['numericas'] for e in estados)]
+    linhas = {}
+    for nome, estado in zip(nomes, estados):
+        linhas[nome] = {}
+        for col in colunas:
+            if col in estado['numericas'] and estado['numericas'][col]['momentos']['n'] > 0:
+                linhas[nome][f'{col} (média)'] = estado['numericas'][col]['momentos']['media']
+                linhas[nome][f'{col} (mediana)'] = quantis(estado['numericas'][col]['sketch'], 0.5)[0]
+    return pd.DataFrame.from_dict(linhas, orient='index').T
+
+
+def relatorio(pasta=PASTA_ONDAS):
+    indice = ler_indice(pasta)
+    if not indice['ondas']:
+        print(f"Nenhuma onda em '{pasta}'. Use: python ondas.py adicionar arquivo.csv")
+        return
+    total = ler_estado(pasta, indice['total'])
+    print(f"--- {len(indice['ondas'])} ondas, {total['n']} alunos no total ---")
+    for onda in indice['ondas']:
+        print(f"{onda['nome']:<20} {onda['linhas']:>10} alunos  (adicionada em {onda['adicionada_em']})")
+
+    print("\n--- Tabela Descritiva do Total (Variáveis Quantitativas) ---")
+    print(tabela_descritiva(total['numericas'], [c for c in COLUNAS_NUMERICAS if c in total['numericas']]))
+
+    testes = testes_do_total(total)
+    if not testes.empty:
+        significativos = testes[testes['p_ajustado'] < 0.05]
+        print(f"\n--- Qui-Quadrado do Total ({len(testes)} pares, {len(significativos)} significativos a 5% após FDR) ---")
+        if not significativos.empty:
+            print(significativos[['variavel_1', 'variavel_2', 'estatistica', 'p_valor', 'p_ajustado']]
+                  .head(15).to_string(index=False))
+
+    nomes = [onda['nome'] for onda in indice['ondas']]
+    estados = [ler_estado(pasta, onda['estado']) for onda in indice['ondas']]
+    print("\n--- Médias e Medianas por Onda ---")
+    print(medias_por_onda(nomes, estados).to_string(float_format=lambda v: f'{v:.2f}'))
+    if len(estados) > 1:
+        comparacao = comparar_ondas(estados)
+        arquivo_comparacao = os.path.join(pasta, ARQUIVO_COMPARACAO)
+        comparacao.to_csv(arquivo_comparacao, index=False)
+        mudaram = comparacao[comparacao['p_ajustado'] < 0.05]
+        print(f"\n--- Diferenças entre Ondas ({len(mudaram)} de {len(comparacao)} variáveis a 5% após FDR; "
+              f"tabela completa em '{arquivo_comparacao}') ---")
+        if not mudaram.empty:
+            print(mudaram.to_string(index=False))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Acumula as ondas da pesquisa sem reprocessar as anteriores.')
+    parser.add_argument('--pasta', default=PASTA_ONDAS, help='Pasta com o estado acumulado das ondas.')
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+    adicionar = subparsers.add_parser('adicionar', help='Agrega um ou mais arquivos novos, uma onda por arquivo.')
+    adicionar.add_argument('arquivos', nargs='+')
+    adicionar.add_argument('--nome', help='Nome da onda (padrão: nome do arquivo); só com um arquivo.')
+    subparsers.add_parser('resumo', help='Totais e comparações entre ondas, a partir do estado gravado.')
+    args = parser.parse_args(argv)
+
+    if args.comando == 'adicionar':
+        if args.nome and len(args.arquivos) > 1:
+            parser.error('--nome só pode ser usado com um arquivo.')
+        for arquivo in args.arquivos:
+            try:
+                adicionar_onda(arquivo, args.nome, args.pasta)
+            except ValueError as e:
+                parser.exit(1, f"Erro ao adicionar '{arquivo}': {e}\n")
+        print()
+    try:
+        relatorio(args.pasta)
+    except ValueError as e:
+        parser.exit(1, f"Erro: {e}\n")
+
+
+if __name__ == '__main__':
+    main()
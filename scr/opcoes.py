@@ -0,0 +1,54 @@
+# Opções de linha de comando compartilhadas pelos scripts. Este módulo não importa pandas,
+# seaborn nem scipy: um --help ou um subcomando que não precise deles continua rápido.
+import os
+
+from instrumentacao import MODOS_PERFIL, TOP_N
+
+PASTA_PREVIA = 'previa'
+DPI_PREVIA = 72
+
+
+def parse_ids(texto):
+    if not texto:
+        return None
+    return {int(parte) for parte in texto.split(',') if parte.strip()}
+
+
+def adicionar_opcoes_graficos(parser, exemplo_ids):
+    parser.add_argument('--only', type=parse_ids, default=None,
+                        help=f'Gera só os gráficos com esses números, ex.: --only {exemplo_ids}')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Processos usados na renderização (padrão: número de núcleos).')
+    parser.add_argument('--forcar', action='store_true',
+                        help='Redesenha todos os gráficos, mesmo os que não mudaram desde a última execução.')
+
+
+def adicionar_opcoes_instrumentacao(parser):
+    parser.add_argument('--perfil', choices=MODOS_PERFIL, default=None,
+                        help='Captura um perfil da execução; força a renderização em um só processo.')
+    parser.add_argument('--top', type=int, default=TOP_N,
+                        help='Linhas das tabelas de etapas e gráficos mais lentos no fim da execução.')
+
+
+def adicionar_opcoes_qualidade(parser):
+    modo = parser.add_mutually_exclusive_group()
+    modo.add_argument('--previa', action='store_true',
+                      help=f'Prévias rápidas (baixa resolução ou SVG) na subpasta {PASTA_PREVIA}/, sem os testes.')
+    modo.add_argument('--final', action='store_true',
+                      help='PNG em 300 dpi só dos gráficos alterados cuja versão atual já tem prévia.')
+    modo.add_argument('--observar', action='store_true',
+                      help='Prévias num processo que fica aberto e redesenha a cada edição de catalogo.py ou desenhos.py.')
+    modo.add_argument('--documento', metavar='ARQUIVO',
+                      help='Um só documento .pdf ou .html com todos os gráficos e tabelas, em vez dos PNG soltos.')
+    parser.add_argument('--formato-previa', choices=('png', 'svg'), default='png')
+    parser.add_argument('--dpi-previa', type=int, default=DPI_PREVIA)
+
+
+def destino_dos_graficos(args, pasta):
+    # (pasta de saída, qualidade do desenho, pasta das prévias que autorizam o modo final)
+    previas = os.path.join(pasta, PASTA_PREVIA)
+    if args.previa or args.observar:
+        return previas, {'dpi': args.dpi_previa, 'formato': args.formato_previa}, None
+    if args.final:
+        return pasta, None, previas
+    return pasta, None, None
@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+
+sexo_map = {1: 'Masculino', 2: 'Feminino'}
+sim_nao_map = {1: 'Sim', 2: 'Não'}
+periodo_map = {1: 'Diurno', 2: 'Noturno'}
+sentimento_map = {1: 'Entusiasmado', 2: 'Obrigado a aprender', 3: 'Acho difícil'}
+mora_com_map = {1: 'Sozinho(a)', 2: 'Com Amigos', 3: 'Com a Família'}
+dispositivo_map = {1: 'Celular', 2: 'Tablet', 3: 'Computador/Notebook'}
+representa_map = {
+    1: 'Avanço que melhora a vida',
+    2: 'Comunicação mais rápida',
+    3: 'Atrapalha e complica'
+}
+
+map_config = {
+    'sexo': sexo_map,
+    'periodo': periodo_map,
+    'trabalha': sim_nao_map,
+    'mora_com': mora_com_map,
+    'dispositivo_mais_acessado': dispositivo_map,
+    'redes_sociais_ambiente_toxico': sim_nao_map,
+    'sentimento_informatica': sentimento_map,
+    'internet_atrapalha_formacao': sim_nao_map,
+    'o_que_o_computador_representa_para_voce': representa_map,
+    'voce_costuma_acessar_a_internet': sim_nao_map
+}
+
+colunas_uso_internet = [
+    'usa_internet_trabalho', 'usa_internet_amigos', 'usa_internet_desconhecido',
+    'usa_internet_email', 'usa_internet_pesquisa', 'usa_internet_noticias',
+    'usa_internet_compras', 'usa_internet_videos', 'usa_internet_jogos',
+    'usa_internet_download'
+]
+for col in colunas_uso_internet:
+    map_config[col] = sim_nao_map
+
+# Escalas em que a ordem dos códigos tem sentido (do mais positivo ao mais negativo): viram
+# categorias ordenadas e entram nas correlações de postos.
+escalas_ordinais = ['sentimento_informatica']
+
+# Um CategoricalDtype por dicionário: colunas que compartilham o mapa (ex.: sim_nao_map)
+# compartilham as categorias, e os rótulos ficam só uma vez na memória.
+_tipos_por_mapa = {}
+tipos_categoricos = {}
+for col, mapping in map_config.items():
+    chave = (id(mapping), col in escalas_ordinais)
+    if chave not in _tipos_por_mapa:
+        _tipos_por_mapa[chave] = pd.CategoricalDtype([mapping[k] for k in sorted(mapping)],
+                                                     ordered=col in escalas_ordinais)
+    tipos_categoricos[col] = _tipos_por_mapa[chave]
+
+# Tipos pequenos usados na leitura em blocos (nomes já padronizados).
+# Colunas codificadas cabem em Int8; as quantitativas em float32 para aceitar NaN.
+tipos_colunas = {col: 'Int8' for col in map_config}
+tipos_colunas.update({
+    'id': 'Int32',
+    'semestre': 'Int8',
+    'semestre_que_est_cursando': 'Int8',
+    'tempo_uso_computador': 'Int8',
+    'idade': 'float32',
+    'tempo_estudo_diario': 'float32',
+    'tempo_conectado_diario': 'float32',
+    'tempo_estudo_internet': 'float32',
+    'renda_familiar': 'str',
+})
+
+bins_semestre = [0, 3, 7, 10]
+labels_semestre = ['Iniciante (1-3)', 'Intermediário (4-7)', 'Finalista (8-10)']
+bins_renda = [0, 3000, 6000, np.inf]
+labels_renda = ['Baixa (até R$3k)', 'Média (R$3k-R$6k)', 'Alta (> R$6k)']
+# Faixas derivadas de semestre e renda em adicionar_faixas
+colunas_faixas = ['faixa_semestre', 'faixa_renda']
+
+numeric_cols = ['idade', 'tempo_estudo_diario', 'tempo_conectado_diario', 'tempo_estudo_internet', 'semestre_que_est_cursando']
+
+
+def padronizar_nome(coluna):
+    return coluna.lower().replace(' ', '_').replace('?', '')
+
+
+def padronizar_colunas(df):
+    df.columns = df.columns.str.lower().str.replace(' ', '_').str.replace('?', '', regex=False)
+    return df
+
+
+def codificar_categorico(serie, mapping, tipo):
+    valores = pd.to_numeric(serie, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    codigos = np.full(len(valores), -1, dtype='int8')
+    for i, chave in enumerate(sorted(mapping)):
+        codigos[valores == chave] = i
+    return pd.Categorical.from_codes(codigos, dtype=tipo)
+
+
+def codificar_colunas(df):
+    for col, mapping in map_config.items():
+        if col in df.columns:
+            df[col] = codificar_categorico(df[col], mapping, tipos_categoricos[col])
+    return df
+
+
+def converter_renda(df):
+    if 'renda_familiar' in df.columns:
+        df['renda_familiar'] = df['renda_familiar'].astype(str).str.replace(r'R\$\s*', '', regex=True)
+        df['renda_familiar'] = df['renda_familiar'].str.replace('.', '', regex=False).str.replace(',', '.', regex=False)
+        df['renda_familiar'] = pd.to_numeric(df['renda_familiar'], errors='coerce').astype('float32')
+    return df
+
+
+def converter_numericas(df):
+    for col in numeric_cols:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df
+
+
+def preparar_dados(df):
+    codificar_colunas(df)
+    converter_renda(df)
+    converter_numericas(df)
+    adicionar_bits_uso(df)
+    return adicionar_faixas(df)
+
+
+def adicionar_bits_uso(df):
+    # as dez finalidades de uso da internet também ficam empacotadas em um uint16 por aluno
+    # (bit j = colunas_uso_internet[j] respondida com 'Sim')
+    bits = np.zeros(len(df), dtype=np.uint16)
+    for j, col in enumerate(colunas_uso_internet):
+        if col in df.columns:
+            sim = df[col].cat.codes.to_numpy() == df[col].cat.categories.get_loc('Sim')
+            bits |= sim.astype(np.uint16) << np.uint16(j)
+    df['uso_internet_bits'] = bits
+    return df
+
+
+def adicionar_faixas(df):
+    col_semestre = 'semestre_que_est_cursando' if 'semestre_que_est_cursando' in df.columns else 'semestre'
+    if col_semestre in df.columns:
+        df['faixa_semestre'] = pd.cut(df[col_semestre], bins=bins_semestre, labels=labels_semestre, right=True)
+    if 'renda_familiar' in df.columns:
+        df['faixa_renda'] = pd.cut(df['renda_familiar'], bins=bins_renda, labels=labels_renda, right=False)
+    return df
@@ -0,0 +1,50 @@
+import importlib
+import os
+import time
+
+INTERVALO_OBSERVACAO = 0.25
+# Recarregados nessa ordem a cada edição: quem importa vem depois de quem é importado
+MODULOS_RECARREGADOS = ('desenhos', 'agregacao', 'registro', 'catalogo')
+ARQUIVOS_OBSERVADOS = ('catalogo.py', 'desenhos.py')
+
+
+def _caminho(arquivo):
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), arquivo)
+
+
+def _modificacoes():
+    return {arquivo: os.stat(_caminho(arquivo)).st_mtime_ns for arquivo in ARQUIVOS_OBSERVADOS}
+
+
+def observar(df, nome_specs, pasta, tema, qualidade, somente=None):
+    # o processo fica aberto com os dados e as bibliotecas já carregados; cada edição só redesenha
+    # as prévias dos gráficos cujo hash mudou (ou todas, se mudou o código de desenho)
+    modulos = {nome: importlib.import_module(nome) for nome in MODULOS_RECARREGADOS}
+    vistos = _modificacoes()
+    alterados, forcar = [], False
+    print(f"\nObservando {', '.join(ARQUIVOS_OBSERVADOS)}; prévias em '{pasta}'. Ctrl+C para sair.")
+    try:
+        while True:
+            inicio = time.perf_counter()
+            try:
+                forcar = forcar or 'desenhos.py' in alterados
+                for nome in MODULOS_RECARREGADOS if alterados else ():
+                    modulos[nome] = importlib.reload(modulos[nome])
+                specs = getattr(modulos['catalogo'], nome_specs)
+                modulos['registro'].executar_graficos(df, specs, pasta, somente=somente, workers=1, tema=tema,
+                                                      incremental=not forcar,
+                                                      qualidade=qualidade)
+                forcar = False
+                print(f"Prévias atualizadas em {time.perf_counter() - inicio:.2f} s.")
+            except Exception as e:
+                print(f"Erro ao gerar as prévias: {type(e).__name__}: {e}")
+
+            alterados = []
+            while not alterados:
+                time.sleep(INTERVALO_OBSERVACAO)
+                atuais = _modificacoes()
+                alterados = [arquivo for arquivo in ARQUIVOS_OBSERVADOS if atuais[arquivo] != vistos[arquivo]]
+            vistos = atuais
+            print(f"\n{', '.join(alterados)} alterado; redesenhando...")
+    except KeyboardInterrupt:
+        print("\nObservação encerrada.")
@@ -0,0 +1,185 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from significancia import ELEMENTOS_POR_LOTE, benjamini_hochberg, colunas_numericas, estatistica_qui2
+
+REAMOSTRAS = 10_000
+SEMENTE = 42
+# Reamostras por tarefa. Cada tarefa tem o seu fluxo (SeedSequence(semente).spawn), então o
+# resultado não depende do número de processos.
+REAMOSTRAS_POR_TAREFA = 1_000
+GRUPOS_BOOTSTRAP = ['sexo', 'periodo', 'trabalha', 'dispositivo_mais_acessado']
+ARQUIVO_INTERVALOS = 'intervalos_bootstrap.csv'
+
+_problemas = None
+
+
+# --- problemas: só os arrays necessários para recalcular cada estatística ---
+
+def problema_qui2(df, col_a, col_b):
+    a, b = df[col_a].cat.codes.to_numpy(), df[col_b].cat.codes.to_numpy()
+    validos = (a >= 0) & (b >= 0)
+    return {'tipo': 'qui2', 'a': a[validos].astype(np.int64), 'b': b[validos].astype(np.int64),
+            'na': len(df[col_a].cat.categories), 'nb': len(df[col_b].cat.categories)}
+
+
+def problema_postos(df, col_num, col_grupo):
+    valores = df[col_num].to_numpy(dtype='float64', na_value=np.nan)
+    grupos = df[col_grupo].cat.codes.to_numpy()
+    validos = ~np.isnan(valores) & (grupos >= 0)
+    return {'tipo': 'postos', 'posto': stats.rankdata(valores[validos]), 'grupos': grupos[validos].astype(np.int64),
+            'k': len(df[col_grupo].cat.categories)}
+
+
+def problema_mediana(valores):
+    return {'tipo': 'mediana', 'x': valores[~np.isnan(valores)]}
+
+
+def problema_correlacao(df, col_x, col_y):
+    x = df[col_x].to_numpy(dtype='float64', na_value=np.nan)
+    y = df[col_y].to_numpy(dtype='float64', na_value=np.nan)
+    validos = ~np.isnan(x) & ~np.isnan(y)
+    return {'tipo': 'correlacao', 'x': x[validos], 'y': y[validos]}
+
+
+def tamanho(problema):
+    return len(problema['a'] if problema['tipo'] == 'qui2' else
+               problema['posto'] if problema['tipo'] == 'postos' else problema['x'])
+
+
+# --- estatísticas calculadas de uma vez para um lote de reamostras (uma linha de índices por reamostra) ---
+
+def estatistica_permutada(problema, indices):
+    lote = len(indices)
+    if problema['tipo'] == 'qui2':
+        # permutar b mantém as margens, então os esperados são os mesmos para todas as reamostras
+        na, nb = problema['na'], problema['nb']
+        combinado = problema['a'] * nb + problema['b'][indices] + (np.arange(lote) * na * nb)[:, None]
+        tabelas = np.bincount(combinado.ravel(), minlength=lote * na * nb).reshape(lote, na, nb).astype('float64')
+        linhas, colunas = tabelas[0].sum(axis=1), tabelas[0].sum(axis=0)
+        esperados = (linhas[:, None] * colunas[None, :] / linhas.sum())[None]
+        return estatistica_qui2(tabelas, esperados)
+    # soma de R²/n por grupo: cresce junto com o H de Kruskal-Wallis e, com 2 grupos, com |U - n1*n2/2|
+    k, grupos, posto = problema['k'], problema['grupos'], problema['posto']
+    rotulos = grupos[indices] + (np.arange(lote) * k)[:, None]
+    somas = np.bincount(rotulos.ravel(), weights=np.tile(posto, lote), minlength=lote * k).reshape(lote, k)
+    n_por_grupo = np.bincount(grupos, minlength=k)
+    presentes = n_por_grupo > 0
+    return (somas[:, presentes] ** 2 / n_por_grupo[presentes]).sum(axis=1)
+
+
+def estatistica_bootstrap(problema, indices):
+    if problema['tipo'] == 'mediana':
+        return np.median(problema['x'][indices], axis=1)
+    x, y = stats.rankdata(problema['x'][indices], axis=1), stats.rankdata(problema['y'][indices], axis=1)
+    x -= x.mean(axis=1, keepdims=True)
+    y -= y.mean(axis=1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (x * y).sum(axis=1) / np.sqrt((x * x).sum(axis=1) * (y * y).sum(axis=1))
+
+
+def observado(problema):
+    indices = np.arange(tamanho(problema))[None]
+    if problema['tipo'] in ('qui2', 'postos'):
+        return estatistica_permutada(problema, indices)[0]
+    return estatistica_bootstrap(problema, indices)[0]
+
+
+# --- distribuição de reamostras, em lotes e num pool de processos ---
+
+def _iniciar_worker(problemas):
+    global _problemas
+    _problemas = problemas
+
+
+def _reamostrar(tarefa):
+    semente, reamostras = tarefa
+    rng = np.random.default_rng(semente)
+    # o mesmo lote de índices serve a todos os problemas do mesmo tamanho; os índices são sorteados
+    # lote a lote, para a memória ficar em ELEMENTOS_POR_LOTE e não em reamostras x n
+    por_tamanho = {}
+    for posicao, problema in enumerate(_problemas):
+        por_tamanho.setdefault(tamanho(problema), []).append(posicao)
+    resultados = [[] for _ in _problemas]
+    for n, posicoes in por_tamanho.items():
+        permutacao = _problemas[posicoes[0]]['tipo'] in ('qui2', 'postos')
+        funcao = estatistica_permutada if permutacao else estatistica_bootstrap
+        por_lote = max(1, ELEMENTOS_POR_LOTE // max(1, n))
+        for inicio in range(0, reamostras, por_lote):
+            lote = min(por_lote, reamostras - inicio)
+            if permutacao:
+                indices = rng.permuted(np.tile(np.arange(n), (lote, 1)), axis=1)
+            else:
+                indices = rng.integers(0, n, size=(lote, n))
+            for posicao in posicoes:
+                resultados[posicao].append(funcao(_problemas[posicao], indices))
+    return [np.concatenate(partes) for partes in resultados]
+
+
+def tarefas_de_reamostragem(reamostras, semente):
+    partes = -(-reamostras // REAMOSTRAS_POR_TAREFA)
+    sementes = np.random.SeedSequence(semente).spawn(partes)
+    return [(sementes[i], min(REAMOSTRAS_POR_TAREFA, reamostras - i * REAMOSTRAS_POR_TAREFA)) for i in range(partes)]
+
+
+def distribuicoes(problemas, reamostras=REAMOSTRAS, semente=SEMENTE, workers=None):
+    # problemas de permutação e de bootstrap não compartilham índices: cada família sorteia os seus
+    tarefas = tarefas_de_reamostragem(reamostras, semente)
+    workers = min(workers or os.cpu_count() or 1, len(tarefas))
+    if workers <= 1:
+        _iniciar_worker(problemas)
+        partes = [_reamostrar(tarefa) for tarefa in tarefas]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_worker, initargs=(problemas,)) as executor:
+            partes = list(executor.map(_reamostrar, tarefas))
+    return [np.concatenate([parte[i] for parte in partes]) for i in range(len(problemas))]
+
+
+# --- p-valores de permutação e intervalos bootstrap ---
+
+def p_valores_permutacao(df, resultados, reamostras=REAMOSTRAS, semente=SEMENTE, workers=None):
+    problemas = [problema_qui2(df, linha.variavel_1, linha.variavel_2) if linha.teste == 'qui-quadrado'
+                 else problema_postos(df, linha.variavel_1, linha.variavel_2)
+                 for linha in resultados.itertuples()]
+    nulas = distribuicoes(problemas, reamostras, semente, workers)
+    p_valores = [(1 + np.count_nonzero(nula >= observado(problema) * (1 - 1e-12))) / (1 + len(nula))
+                 for problema, nula in zip(problemas, nulas)]
+    resultados = resultados.copy()
+    resultados['p_permutacao'] = p_valores
+    resultados['p_perm_ajustado'] = benjamini_hochberg(resultados['p_permutacao'])
+    return resultados
+
+
+def intervalos_bootstrap(df, reamostras=REAMOSTRAS, semente=SEMENTE, workers=None, nivel=0.95):
+    numericas = colunas_numericas(df)
+    rotulos, problemas = [], []
+    for col in numericas:
+        valores = df[col].to_numpy(dtype='float64', na_value=np.nan)
+        rotulos.append(('mediana', col, 'todos'))
+        problemas.append(problema_mediana(valores))
+        for grupo in [g for g in GRUPOS_BOOTSTRAP if g in df.columns]:
+            codigos = df[grupo].cat.codes.to_numpy()
+            for i, categoria in enumerate(df[grupo].cat.categories):
+                subconjunto = valores[codigos == i]
+                if np.count_nonzero(~np.isnan(subconjunto)) > 1:
+                    rotulos.append(('mediana', col, f"{grupo}={categoria}"))
+                    problemas.append(problema_mediana(subconjunto))
+    for col_x, col_y in combinations(numericas, 2):
+        problema = problema_correlacao(df, col_x, col_y)
+        if tamanho(problema) > 2:
+            rotulos.append(('spearman', col_x, col_y))
+            problemas.append(problema)
+
+    reamostras_por_problema = distribuicoes(problemas, reamostras, semente, workers)
+    alfa = (1 - nivel) / 2
+    linhas = []
+    for (estatistica, variavel, recorte), problema, valores in zip(rotulos, problemas, reamostras_por_problema):
+        inferior, superior = np.nanquantile(valores, [alfa, 1 - alfa])
+        linhas.append((estatistica, variavel, recorte, tamanho(problema), observado(problema), inferior, superior))
+    return pd.DataFrame(linhas, columns=['estatistica', 'variavel', 'recorte', 'n', 'valor', 'ic_inferior',
+                                         'ic_superior'])
@@ -0,0 +1,139 @@
+import os
+from functools import partial
+
+from agregacao import agregados_do_grafico, calcular_agregados
+from desenhos import desenhar, desenhar_pagina, imprimir_estatisticas
+from instrumentacao import etapa
+from manifesto import chave_de_saida, graficos_alterados, gravar_manifesto, hash_colunas, hash_do_conteudo, \
+    hash_grafico, ler_manifesto
+from renderizacao import renderizar_em_paralelo
+
+CHAVES_COLUNA = ('coluna', 'x', 'y', 'hue', 'col', 'row', 'grupo')
+
+
+def colunas_do_grafico(spec):
+    colunas = [spec[k] for k in CHAVES_COLUNA if k in spec]
+    colunas += spec.get('variaveis', [])
+    return list(dict.fromkeys(colunas))
+
+
+def selecionar_graficos(df, specs, somente=None):
+    # o mesmo arquivo de saída só é gerado uma vez; a última definição vence
+    unicos = {}
+    for spec in specs:
+        unicos.pop(spec['arquivo'], None)
+        unicos[spec['arquivo']] = spec
+
+    selecionados = []
+    for spec in unicos.values():
+        if somente is not None and spec['id'] not in somente:
+            continue
+        faltando = [col for col in colunas_do_grafico(spec) if col not in df.columns or not df[col].notna().any()]
+        if faltando:
+            if somente is not None:
+                print(f"Gráfico {spec['id']} ignorado: colunas ausentes ou vazias {faltando}.")
+            continue
+        selecionados.append(spec)
+    return selecionados
+
+
+def executar_graficos(df, specs, pasta, somente=None, workers=None, tema=None, incremental=True, fonte=None,
+                      qualidade=None, aceitos_em=None):
+    # qualidade: dpi/formato das prévias; aceitos_em: pasta das prévias, no modo final só redesenha
+    # os gráficos cuja versão atual (mesmo hash) já foi pré-visualizada
+    if not os.path.exists(pasta):
+        os.makedirs(pasta)
+        print(f"Pasta '{pasta}' criada com sucesso.")
+    selecionados = selecionar_graficos(df, specs, somente)
+    if not selecionados:
+        print("Nenhum gráfico selecionado.")
+        return []
+
+    with etapa('Manifesto (hash das colunas e gráficos)'):
+        colunas = {col for spec in selecionados for col in colunas_do_grafico(spec)}
+        hashes_colunas = hash_colunas(df, sorted(colunas))
+        hashes = {spec['arquivo']: chave_de_saida(hash_grafico(spec, colunas_do_grafico(spec), hashes_colunas, tema),
+                                                  qualidade)
+                  for spec in selecionados}
+        manifesto = ler_manifesto(pasta)
+        formato = (qualidade or {}).get('formato')
+        pendentes = graficos_alterados(selecionados, hashes, pasta, manifesto, formato) if incremental else selecionados
+        sem_previa = []
+        if aceitos_em is not None:
+            previas = ler_manifesto(aceitos_em)
+            sem_previa = [spec for spec in pendentes if hash_do_conteudo(previas.get(spec['arquivo']))
+                          != hash_do_conteudo(hashes[spec['arquivo']])]
+            pendentes = [spec for spec in pendentes if spec not in sem_previa]
+
+    # uma passada por coluna alimenta tanto os prints quanto os desenhos de todos os gráficos
+    with etapa('Agregação dos gráficos', 'agregacao'):
+        agregados = calcular_agregados(df, selecionados)
+    for spec in selecionados:
+        if spec in sem_previa and os.path.exists(os.path.join(pasta, spec['arquivo'])):
+            print(f"Gráfico {spec['id']} mudou, mas a versão atual ainda não tem prévia; mantido '{spec['arquivo']}'.")
+        elif spec in sem_previa:
+            print(f"Gráfico {spec['id']} não gerado: a versão atual ainda não tem prévia em '{aceitos_em}'.")
+        elif spec not in pendentes:
+            imprimir_estatisticas(df, spec, agregados_do_grafico(agregados, spec))
+            print(f"Gráfico {spec['id']} sem alterações, mantido '{spec['arquivo']}'.")
+
+    if pendentes:
+        tarefas = [partial(desenhar, spec=spec, pasta=pasta, agregados=agregados_do_grafico(agregados, spec),
+                           qualidade=qualidade)
+                   for spec in pendentes]
+        with etapa(f'Renderização ({len(tarefas)} gráficos)'):
+            renderizar_em_paralelo(tarefas, df, workers=workers, tema=tema, fonte=fonte)
+        manifesto.update({spec['arquivo']: hashes[spec['arquivo']] for spec in pendentes})
+        gravar_manifesto(pasta, manifesto)
+    return pendentes
+
+
+def executar_graficos_no_documento(df, specs, doc, somente=None, workers=None, tema=None, fonte=None):
+    # todos os gráficos vão para um documento só (documento.py), na ordem do catálogo; sem manifesto,
+    # porque o documento é sempre gravado inteiro
+    from documento import adicionar_grafico
+
+    selecionados = selecionar_graficos(df, specs, somente)
+    if not selecionados:
+        print("Nenhum gráfico selecionado.")
+        return []
+    with etapa('Agregação dos gráficos', 'agregacao'):
+        agregados = calcular_agregados(df, selecionados)
+    tarefas = [partial(desenhar_pagina, spec=spec, agregados=agregados_do_grafico(agregados, spec),
+                       formato=doc['formato'])
+               for spec in selecionados]
+    paginas = iter(selecionados)
+
+    def gravar(texto, conteudo):
+        adicionar_grafico(doc, next(paginas), conteudo, texto)
+
+    with etapa(f'Renderização no documento ({len(tarefas)} gráficos)'):
+        renderizar_em_paralelo(tarefas, df, workers=workers, tema=tema, fonte=fonte, ao_terminar=gravar)
+    return selecionados
+
+
+# Tipos que sabem se desenhar só a partir dos agregados em blocos, sem o DataFrame em memória
+TIPOS_AGREGAVEIS = ('histograma',)
+
+
+def executar_graficos_agregados(specs, agregados, pasta, somente=None, workers=None, tema=None):
+    if not os.path.exists(pasta):
+        os.makedirs(pasta)
+        print(f"Pasta '{pasta}' criada com sucesso.")
+    selecionados = [spec for spec in specs
+                    if spec['tipo'] in TIPOS_AGREGAVEIS and spec['coluna'] in agregados
+                    and (somente is None or spec['id'] in somente)]
+    if not selecionados:
+        print("Nenhum gráfico pode ser gerado a partir dos agregados em blocos.")
+        return []
+    tarefas = [partial(desenhar, spec=spec, pasta=pasta, agregados=agregados_do_grafico(agregados, spec))
+               for spec in selecionados]
+    with etapa(f'Renderização ({len(tarefas)} gráficos)'):
+        renderizar_em_paralelo(tarefas, None, workers=workers, tema=tema)
+    # as imagens foram trocadas por versões aproximadas: o modo normal precisa redesenhá-las
+    manifesto = ler_manifesto(pasta)
+    if manifesto:
+        for spec in selecionados:
+            manifesto.pop(spec['arquivo'], None)
+        gravar_manifesto(pasta, manifesto)
+    return selecionados
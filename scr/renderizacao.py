@@ -0,0 +1,90 @@
+import contextlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from instrumentacao import capturar, registrar
+
+_df = None
+_fonte = None
+# pool aberto por pool_compartilhado(); enquanto existir, renderizar_em_paralelo o reaproveita
+_compartilhado = {}
+
+
+def _iniciar_worker(df, tema):
+    global _df
+    import matplotlib
+    matplotlib.use('Agg')
+    import seaborn as sns
+    sns.set_theme(**tema)
+    _df = df
+
+
+def _executar(tarefa):
+    # a saída de cada gráfico volta como texto para o processo principal imprimir em ordem,
+    # junto com as medições de tempo e memória feitas no worker e o que a tarefa devolveu
+    saida = io.StringIO()
+    with capturar() as medicoes, contextlib.redirect_stdout(saida):
+        resultado = tarefa(_df)
+    return saida.getvalue(), medicoes, resultado
+
+
+def _executar_de_fonte(argumentos):
+    # o worker do pool compartilhado lê os dados do cache feather e guarda o último lido
+    global _df, _fonte
+    fonte, tarefa = argumentos
+    if fonte is None:
+        _df = _fonte = None
+    elif fonte != _fonte:
+        from cache import ler_cache
+        _df, _fonte = ler_cache(fonte), fonte
+    return _executar(tarefa)
+
+
+def numero_workers(workers=None):
+    if workers is None:
+        workers = int(os.environ.get('GRAFICOS_WORKERS', 0)) or os.cpu_count() or 1
+    return max(1, workers)
+
+
+@contextlib.contextmanager
+def pool_compartilhado(workers=None, tema=None):
+    # um só pool para várias rodadas de gráficos (e para o que mais for mandado a ele): os workers
+    # importam as bibliotecas e aplicam o tema uma vez
+    workers = numero_workers(workers)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_worker, initargs=(None, tema or {})) as executor:
+        _compartilhado.update(executor=executor, workers=workers)
+        try:
+            yield executor
+        finally:
+            _compartilhado.clear()
+
+
+def _receber(resultados, ao_terminar):
+    # em ordem, à medida que cada gráfico termina: ao_terminar(texto, resultado) pode gravá-lo e
+    # descartá-lo antes dos próximos chegarem
+    for texto, medicoes, resultado in resultados:
+        registrar(medicoes)
+        print(texto, end='')
+        if ao_terminar is not None:
+            ao_terminar(texto, resultado)
+
+
+def renderizar_em_paralelo(tarefas, df, workers=None, tema=None, fonte=None, ao_terminar=None):
+    # com um pool compartilhado aberto, o DataFrame vai pelo caminho do cache feather (fonte);
+    # o tema é o do pool
+    if _compartilhado and (fonte is not None or df is None):
+        print(f"Renderizando {len(tarefas)} gráficos no pool compartilhado ({_compartilhado['workers']} processos)...")
+        _receber(_compartilhado['executor'].map(_executar_de_fonte, [(fonte, t) for t in tarefas]), ao_terminar)
+        return
+
+    workers = min(numero_workers(workers), len(tarefas))
+    tema = tema or {}
+    if workers <= 1:
+        _iniciar_worker(df, tema)
+        _receber(map(_executar, tarefas), ao_terminar)
+        return
+
+    print(f"Renderizando {len(tarefas)} gráficos em {workers} processos...")
+    with ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_worker, initargs=(df, tema)) as executor:
+        _receber(executor.map(_executar, tarefas), ao_terminar)
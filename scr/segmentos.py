@@ -0,0 +1,61 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from significancia import colunas_categoricas
+
+
+def construir_indices(df, colunas=None):
+    # um bitmap compactado (1 bit por aluno) para cada valor de cada coluna codificada;
+    # montado uma vez, serve para qualquer combinação de segmentos
+    colunas = colunas if colunas is not None else colunas_categoricas(df) + ['semestre']
+    bitmaps = {}
+    for col in colunas:
+        if col not in df.columns:
+            continue
+        serie = df[col] if isinstance(df[col].dtype, pd.CategoricalDtype) else df[col].astype('category')
+        codigos = serie.cat.codes.to_numpy()
+        for i, nivel in enumerate(serie.cat.categories):
+            bitmaps[(col, str(nivel))] = np.packbits(codigos == i)
+    return {'n': len(df), 'bitmaps': bitmaps}
+
+
+def bitmap_do_termo(indices, termo):
+    coluna, sinal, valores = termo.lstrip('!').partition('=')
+    coluna = coluna.strip()
+    if not sinal:
+        raise ValueError(f"Termo de segmento inválido: '{termo}' (use coluna=valor).")
+    bits = np.zeros(-(-indices['n'] // 8), dtype=np.uint8)
+    for valor in valores.split(','):
+        chave = (coluna, valor.strip())
+        if chave not in indices['bitmaps']:
+            disponiveis = sorted(v for c, v in indices['bitmaps'] if c == coluna)
+            raise ValueError(f"Valor '{valor.strip()}' não existe em '{coluna}'. Disponíveis: {disponiveis}")
+        bits |= indices['bitmaps'][chave]
+    return ~bits if termo.startswith('!') else bits
+
+
+def selecionar(indices, expressao):
+    # expressão em forma normal disjuntiva: grupos separados por '|', termos por '&',
+    # '!' nega um termo e vírgulas listam valores alternativos da mesma coluna;
+    # ex.: "periodo=Noturno & faixa_renda=Baixa (até R$3k),Média (R$3k-R$6k) | trabalha=Sim"
+    resultado = np.zeros(-(-indices['n'] // 8), dtype=np.uint8)
+    for grupo in expressao.split('|'):
+        bits = np.full_like(resultado, 0xFF)
+        for termo in grupo.split('&'):
+            bits &= bitmap_do_termo(indices, termo.strip())
+        resultado |= bits
+    return np.flatnonzero(np.unpackbits(resultado, count=indices['n']))
+
+
+def segmentos_por_coluna(indices, coluna):
+    return [f"{coluna}={valor}" for col, valor in indices['bitmaps'] if col == coluna]
+
+
+def nome_da_pasta(expressao):
+    # os operadores viram palavras antes de o resto ser trocado por '_': sem isso
+    # "!trabalha=Sim" e "trabalha=Sim" iriam para a mesma pasta
+    for operador, palavra in (('!', ' nao '), ('|', ' ou '), ('&', ' e '), (',', ' ou ')):
+        expressao = expressao.replace(operador, palavra)
+    return re.sub(r'\W+', '_', expressao).strip('_')
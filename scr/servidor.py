@@ -0,0 +1,206 @@
+import argparse
+import json
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import matplotlib
+matplotlib.use('Agg')
+import seaborn as sns
+
+import graphics
+import main as analise
+from agregacao import agregados_do_grafico, calcular_agregados
+from cache import carregar_dados_limpos
+from carregamento import ARQUIVO_DADOS
+from catalogo import GRAFICOS_ANALISE, GRAFICOS_INDIVIDUAIS
+from correlacao import calcular_correlacoes, tabela_longa
+from desenhos import desenhar_em_bytes
+from registro import selecionar_graficos
+from significancia import colunas_numericas, testes_em_lote
+from uso_internet import co_uso
+
+PORTA = 8000
+MAX_ITENS_CACHE = 256
+DPI_PADRAO = 100
+# dpi acima disso é reduzido: um 3000 pedido por engano desenharia uma imagem de centenas de MB
+DPI_MAXIMO = 600
+
+CONJUNTOS = {
+    'analise': (GRAFICOS_ANALISE, analise.tema),
+    'individuais': (GRAFICOS_INDIVIDUAIS, graphics.tema),
+}
+TABELAS = {
+    'descritiva': lambda df: df[colunas_numericas(df)].astype('float64').describe().T,
+    'testes': testes_em_lote,
+    'correlacoes': lambda df: tabela_longa(calcular_correlacoes(df)),
+    'co_uso': co_uso,
+}
+TIPOS_CONTEUDO = {'png': 'image/png', 'svg': 'image/svg+xml', 'json': 'application/json; charset=utf-8',
+                  'csv': 'text/csv; charset=utf-8'}
+# Parâmetros da URL que não são filtros de coluna
+PARAMETROS = {'formato', 'conjunto', 'dpi'}
+
+_estado = {'df': None}
+_cache = OrderedDict()
+_trava_cache = threading.Lock()
+# o pyplot não é seguro entre threads: só um gráfico é desenhado por vez
+_trava_desenho = threading.Lock()
+
+
+class ErroRequisicao(Exception):
+    def __init__(self, status, mensagem):
+        super().__init__(mensagem)
+        self.status = status
+
+
+def carregar():
+    _estado['df'] = carregar_dados_limpos(ARQUIVO_DADOS)
+    with _trava_cache:
+        _cache.clear()
+
+
+def ler_filtros(consulta, df):
+    filtros = {}
+    for coluna, valores in consulta.items():
+        if coluna in PARAMETROS:
+            continue
+        if coluna not in df.columns:
+            raise ErroRequisicao(400, f"Coluna desconhecida para filtro: '{coluna}'.")
+        filtros[coluna] = tuple(sorted(v for valor in valores for v in valor.split(',')))
+    return tuple(sorted(filtros.items()))
+
+
+def filtrar(df, filtros):
+    for coluna, valores in filtros:
+        df = df[df[coluna].astype(str).isin(valores)]
+    if df.empty:
+        raise ErroRequisicao(404, "Nenhum aluno atende aos filtros.")
+    return df
+
+
+def buscar_no_cache(chave, gerar):
+    with _trava_cache:
+        if chave in _cache:
+            _cache.move_to_end(chave)
+            return _cache[chave]
+    conteudo = gerar()
+    with _trava_cache:
+        _cache[chave] = conteudo
+        _cache.move_to_end(chave)
+        while len(_cache) > MAX_ITENS_CACHE:
+            _cache.popitem(last=False)
+    return conteudo
+
+
+def gerar_grafico(conjunto, id_grafico, filtros, formato, dpi):
+    specs, tema = CONJUNTOS[conjunto]
+    df = filtrar(_estado['df'], filtros)
+    selecionados = selecionar_graficos(df, specs, {id_grafico})
+    if not selecionados:
+        raise ErroRequisicao(404, f"Gráfico {id_grafico} não existe ou não tem dados com esses filtros.")
+    spec = selecionados[0]
+    agregados = agregados_do_grafico(calcular_agregados(df, [spec]), spec)
+    with _trava_desenho:
+        sns.set_theme(**tema)
+        return desenhar_em_bytes(df, spec, agregados, formato, dpi)
+
+
+def gerar_tabela(nome, filtros, formato):
+    tabela = TABELAS[nome](filtrar(_estado['df'], filtros))
+    if formato == 'csv':
+        return tabela.to_csv().encode('utf-8')
+    return tabela.to_json(orient='split', force_ascii=False, default_handler=str).encode('utf-8')
+
+
+def responder(caminho, consulta):
+    partes = [parte for parte in caminho.split('/') if parte]
+    df = _estado['df']
+    conjunto = consulta.get('conjunto', ['analise'])[0]
+    if conjunto not in CONJUNTOS:
+        raise ErroRequisicao(400, f"Conjunto desconhecido: '{conjunto}'.")
+
+    if partes == ['charts']:
+        specs, _ = CONJUNTOS[conjunto]
+        lista = [{'id': spec['id'], 'titulo': spec['titulo'], 'arquivo': spec['arquivo']}
+                 for spec in selecionar_graficos(df, specs)]
+        return 'json', json.dumps(lista, ensure_ascii=False).encode('utf-8')
+
+    if len(partes) == 2 and partes[0] == 'chart':
+        formato = consulta.get('formato', ['png'])[0]
+        if formato not in ('png', 'svg'):
+            raise ErroRequisicao(400, "Formato de gráfico deve ser 'png' ou 'svg'.")
+        try:
+            id_grafico, dpi = int(partes[1]), int(consulta.get('dpi', [DPI_PADRAO])[0])
+        except ValueError:
+            raise ErroRequisicao(400, "Id do gráfico e dpi devem ser números inteiros.")
+        if dpi <= 0:
+            raise ErroRequisicao(400, "O dpi deve ser maior que zero.")
+        dpi = min(dpi, DPI_MAXIMO)
+        filtros = ler_filtros(consulta, df)
+        chave = ('chart', conjunto, id_grafico, filtros, formato, dpi)
+        return formato, buscar_no_cache(chave, lambda: gerar_grafico(conjunto, id_grafico, filtros, formato, dpi))
+
+    if len(partes) == 2 and partes[0] == 'stats':
+        nome, formato = partes[1], consulta.get('formato', ['json'])[0]
+        if nome not in TABELAS:
+            raise ErroRequisicao(404, f"Tabela desconhecida: '{nome}'. Disponíveis: {', '.join(TABELAS)}.")
+        if formato not in ('json', 'csv'):
+            raise ErroRequisicao(400, "Formato de tabela deve ser 'json' ou 'csv'.")
+        filtros = ler_filtros(consulta, df)
+        return formato, buscar_no_cache(('stats', nome, filtros, formato), lambda: gerar_tabela(nome, filtros, formato))
+
+    if partes == ['recarregar']:
+        carregar()
+        return 'json', json.dumps({'linhas': len(_estado['df'])}).encode('utf-8')
+
+    raise ErroRequisicao(404, "Rota desconhecida. Use /charts, /chart/<id>, /stats/<tabela> ou /recarregar.")
+
+
+class Manipulador(BaseHTTPRequestHandler):
+    def do_GET(self):
+        inicio = time.perf_counter()
+        url = urlparse(self.path)
+        try:
+            formato, conteudo = responder(url.path, parse_qs(url.query))
+            status = 200
+        except ErroRequisicao as e:
+            formato, conteudo, status = 'json', json.dumps({'erro': str(e)}, ensure_ascii=False).encode('utf-8'), e.status
+        except Exception as e:
+            # qualquer outra falha (um gráfico que não desenha com esse filtro, por exemplo) vira 500, e não
+            # uma conexão fechada sem resposta
+            self.log_error("Erro ao responder '%s': %s: %s", self.path, type(e).__name__, e)
+            formato, status = 'json', 500
+            conteudo = json.dumps({'erro': f"Erro interno: {type(e).__name__}: {e}"}, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', TIPOS_CONTEUDO[formato])
+        self.send_header('Content-Length', str(len(conteudo)))
+        self.send_header('X-Tempo-Ms', f"{(time.perf_counter() - inicio) * 1000:.1f}")
+        self.end_headers()
+        self.wfile.write(conteudo)
+
+    def log_message(self, formato, *args):
+        print(f"{self.address_string()} - {formato % args}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Servidor local dos gráficos e tabelas da pesquisa.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=PORTA)
+    args = parser.parse_args(argv)
+
+    carregar()
+    print(f"{len(_estado['df'])} alunos carregados. Servindo em http://{args.host}:{args.porta}/charts")
+    servidor = ThreadingHTTPServer((args.host, args.porta), Manipulador)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\nServidor encerrado.")
+    finally:
+        servidor.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from estimadores import COLUNAS_QUANTITATIVAS
+from preparacao import colunas_faixas
+
+COLUNAS_NUMERICAS = COLUNAS_QUANTITATIVAS + ['semestre', 'semestre_que_est_cursando', 'tempo_uso_computador']
+ARQUIVO_RESULTADOS = 'resultados_testes.csv'
+# Limite de elementos por bincount em lote (linhas x pares), para a memória não crescer com o grid
+ELEMENTOS_POR_LOTE = 20_000_000
+
+
+def colunas_categoricas(df):
+    return [col for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)]
+
+
+def colunas_do_grid(df):
+    # as faixas são recortes do semestre e da renda: contra a própria origem dariam p ~ 0 garantido
+    return [col for col in colunas_categoricas(df) if col not in colunas_faixas]
+
+
+def colunas_numericas(df):
+    return [col for col in COLUNAS_NUMERICAS if col in df.columns and df[col].notna().any()]
+
+
+def matriz_codigos(df, colunas):
+    codigos = np.column_stack([df[col].cat.codes.to_numpy().astype(np.int64) for col in colunas])
+    niveis = np.array([len(df[col].cat.categories) for col in colunas])
+    return codigos, niveis
+
+
+# --- qui-quadrado de todos os pares categóricos ---
+
+def tabelas_contingencia(codigos, niveis, pares):
+    # todas as tabelas saem de bincounts sobre o código combinado (a * nb + b), deslocado por par;
+    # os pares são processados em lotes para limitar linhas x pares
+    n_max = niveis.max()
+    tabelas = np.zeros((len(pares), n_max, n_max), dtype=np.int64)
+    por_lote = max(1, ELEMENTOS_POR_LOTE // max(1, len(codigos)))
+    for inicio in range(0, len(pares), por_lote):
+        lote = pares[inicio:inicio + por_lote]
+        a, b = codigos[:, lote[:, 0]], codigos[:, lote[:, 1]]
+        deslocamento = np.arange(len(lote)) * n_max * n_max
+        combinado = a * n_max + b + deslocamento
+        combinado = combinado[(a >= 0) & (b >= 0)]
+        tabelas[inicio:inicio + len(lote)] = np.bincount(
+            combinado, minlength=len(lote) * n_max * n_max).reshape(len(lote), n_max, n_max)
+    return tabelas
+
+
+def estatistica_qui2(observados, esperados):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        termos = np.where(esperados > 0, (observados - esperados) ** 2 / esperados, 0.0)
+    return termos.sum(axis=(1, 2))
+
+
+def qui_quadrado_em_lote(tabelas):
+    # mesmo cálculo do stats.chi2_contingency (com correção de Yates quando gl = 1), para todas as tabelas
+    observados = tabelas.astype('float64')
+    linhas, colunas = observados.sum(axis=2), observados.sum(axis=1)
+    total = linhas.sum(axis=1)
+    n_linhas, n_colunas = (linhas > 0).sum(axis=1), (colunas > 0).sum(axis=1)
+    gl = (n_linhas - 1) * (n_colunas - 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        esperados = linhas[:, :, None] * colunas[:, None, :] / total[:, None, None]
+        v_cramer = np.sqrt(estatistica_qui2(observados, esperados) / (total * (np.minimum(n_linhas, n_colunas) - 1)))
+    diferenca = esperados - observados
+    yates = (gl == 1)[:, None, None]
+    corrigidos = np.where(yates, observados + np.sign(diferenca) * np.minimum(0.5, np.abs(diferenca)), observados)
+    qui2 = estatistica_qui2(corrigidos, esperados)
+    p_valor = np.where(gl > 0, stats.chi2.sf(qui2, np.maximum(gl, 1)), np.nan)
+    return qui2, gl, p_valor, v_cramer, total
+
+
+def testar_pares_categoricos(df, colunas=None):
+    colunas = colunas if colunas is not None else colunas_categoricas(df)
+    if len(colunas) < 2:
+        return pd.DataFrame()
+    codigos, niveis = matriz_codigos(df, colunas)
+    pares = np.array(list(combinations(range(len(colunas)), 2)))
+    qui2, gl, p_valor, v_cramer, total = qui_quadrado_em_lote(tabelas_contingencia(codigos, niveis, pares))
+    return pd.DataFrame({
+        'teste': 'qui-quadrado',
+        'variavel_1': [colunas[i] for i in pares[:, 0]],
+        'variavel_2': [colunas[j] for j in pares[:, 1]],
+        'estatistica': qui2,
+        'gl': gl,
+        'p_valor': p_valor,
+        'efeito': v_cramer,
+        'n': total.astype(np.int64),
+    })
+
+
+# --- Mann-Whitney / Kruskal-Wallis de cada numérica por cada agrupamento ---
+
+def postos(valores):
+    posto = stats.rankdata(valores)
+    _, empates = np.unique(valores, return_counts=True)
+    correcao = 1 - (empates ** 3 - empates).sum() / (len(valores) ** 3 - len(valores)) if len(valores) > 1 else 1.0
+    return posto, empates, correcao
+
+
+def comparar_grupos(posto, empates, correcao, grupos, n_grupos):
+    # somas de postos por grupo num único bincount; com 2 grupos, Mann-Whitney assintótico
+    # (correção de continuidade e de empates, como o scipy); com mais, Kruskal-Wallis
+    n_por_grupo = np.bincount(grupos, minlength=n_grupos)
+    soma_postos = np.bincount(grupos, weights=posto, minlength=n_grupos)
+    presentes = n_por_grupo > 0
+    n_por_grupo, soma_postos = n_por_grupo[presentes], soma_postos[presentes]
+    n = n_por_grupo.sum()
+    if len(n_por_grupo) < 2:
+        return None
+    if len(n_por_grupo) == 2:
+        n1, n2 = n_por_grupo
+        u1 = soma_postos[0] - n1 * (n1 + 1) / 2
+        media = n1 * n2 / 2
+        desvio = np.sqrt(n1 * n2 / 12 * ((n + 1) - (empates ** 3 - empates).sum() / (n * (n - 1))))
+        z = (abs(u1 - media) - 0.5) / desvio if desvio > 0 else np.nan
+        p_valor = min(1.0, 2 * stats.norm.sf(z)) if desvio > 0 else np.nan
+        efeito = u1 / (n1 * n2)
+        return 'mann-whitney', u1, 1, p_valor, efeito, n
+    h = 12 / (n * (n + 1)) * (soma_postos ** 2 / n_por_grupo).sum() - 3 * (n + 1)
+    h = h / correcao if correcao > 0 else np.nan
+    gl = len(n_por_grupo) - 1
+    efeito = max(0.0, (h - gl) / (n - len(n_por_grupo))) if n > len(n_por_grupo) else np.nan
+    return 'kruskal-wallis', h, gl, stats.chi2.sf(h, gl), efeito, n
+
+
+def testar_numericas_por_grupo(df, numericas=None, categoricas=None):
+    numericas = numericas if numericas is not None else colunas_numericas(df)
+    categoricas = categoricas if categoricas is not None else colunas_categoricas(df)
+    linhas = []
+    for num in numericas:
+        valores = df[num].to_numpy(dtype='float64', na_value=np.nan)
+        validos_num = ~np.isnan(valores)
+        cache_postos = {}
+        for cat in categoricas:
+            codigos = df[cat].cat.codes.to_numpy()
+            validos = validos_num & (codigos >= 0)
+            # os postos só precisam ser recalculados quando o agrupamento tem faltantes próprios
+            chave = validos.tobytes() if not np.array_equal(validos, validos_num) else None
+            if chave not in cache_postos:
+                cache_postos[chave] = postos(valores[validos])
+            resultado = comparar_grupos(*cache_postos[chave], codigos[validos], len(df[cat].cat.categories))
+            if resultado is not None:
+                teste, estatistica, gl, p_valor, efeito, n = resultado
+                linhas.append((teste, num, cat, estatistica, gl, p_valor, efeito, n))
+    return pd.DataFrame(linhas, columns=['teste', 'variavel_1', 'variavel_2', 'estatistica', 'gl', 'p_valor',
+                                         'efeito', 'n'])
+
+
+def benjamini_hochberg(p_valores):
+    p = np.asarray(p_valores, dtype='float64')
+    ajustados = np.full(len(p), np.nan)
+    validos = ~np.isnan(p)
+    m = validos.sum()
+    if m == 0:
+        return ajustados
+    ordem = np.argsort(p[validos])
+    ordenados = p[validos][ordem] * m / np.arange(1, m + 1)
+    ordenados = np.minimum.accumulate(ordenados[::-1])[::-1]
+    resultado = np.empty(m)
+    resultado[ordem] = np.minimum(ordenados, 1.0)
+    ajustados[validos] = resultado
+    return ajustados
+
+
+def testes_em_lote(df):
+    categoricas = colunas_do_grid(df)
+    resultados = pd.concat([testar_pares_categoricos(df, categoricas),
+                            testar_numericas_por_grupo(df, categoricas=categoricas)], ignore_index=True)
+    if resultados.empty:
+        return resultados
+    resultados['p_ajustado'] = benjamini_hochberg(resultados['p_valor'])
+    return resultados.sort_values(['p_ajustado', 'p_valor'], kind='stable').reset_index(drop=True)
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+from preparacao import colunas_uso_internet
+
+
+def matriz_uso(df, colunas=colunas_uso_internet, resposta='Sim'):
+    # matriz booleana alunos x finalidades; resposta ausente conta como "não usa"
+    colunas = [col for col in colunas if col in df.columns]
+    if resposta == 'Sim' and 'uso_internet_bits' in df.columns:
+        posicoes = np.array([colunas_uso_internet.index(col) for col in colunas], dtype=np.uint16)
+        return desempacotar(df['uso_internet_bits'].to_numpy(), posicoes), colunas
+    matriz = np.zeros((len(df), len(colunas)), dtype=bool)
+    for j, col in enumerate(colunas):
+        serie = df[col]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            matriz[:, j] = serie.cat.codes.to_numpy() == serie.cat.categories.get_loc(resposta)
+        else:
+            matriz[:, j] = serie.eq(resposta).to_numpy()
+    return matriz, colunas
+
+
+def desempacotar(bits, posicoes):
+    return ((bits[:, None] >> posicoes) & 1).astype(bool)
+
+
+def codigos_combinados(df, colunas):
+    # junta várias colunas categóricas em um único código (base mista); -1 se qualquer uma faltar
+    codigos = np.zeros(len(df), dtype=np.int64)
+    validos = np.ones(len(df), dtype=bool)
+    niveis = []
+    for col in colunas:
+        serie = df[col] if isinstance(df[col].dtype, pd.CategoricalDtype) else df[col].astype('category')
+        c = serie.cat.codes.to_numpy().astype(np.int64)
+        validos &= c >= 0
+        codigos = codigos * len(serie.cat.categories) + c
+        niveis.append(serie.cat.categories)
+    codigos[~validos] = -1
+    return codigos, niveis
+
+
+def indice_combinado(niveis):
+    if len(niveis) == 1:
+        return pd.Index(niveis[0])
+    return pd.MultiIndex.from_product(niveis)
+
+
+def contagens_por_grupo(matriz, codigos, n_grupos):
+    validos = codigos >= 0
+    totais = np.bincount(codigos[validos], minlength=n_grupos)
+    linhas, cols = np.nonzero(matriz & validos[:, None])
+    k = matriz.shape[1]
+    sim = np.bincount(codigos[linhas] * k + cols, minlength=n_grupos * k).reshape(n_grupos, k)
+    return totais, sim
+
+
+def proporcoes_por_grupo(df, grupos, colunas=colunas_uso_internet):
+    if isinstance(grupos, str):
+        grupos = [grupos]
+    matriz, colunas = matriz_uso(df, colunas)
+    codigos, niveis = codigos_combinados(df, grupos)
+    indice = indice_combinado(niveis)
+    totais, sim = contagens_por_grupo(matriz, codigos, len(indice))
+    observados = totais > 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        proporcoes = sim[observados] / totais[observados, None]
+    return pd.DataFrame(proporcoes, index=indice[observados], columns=colunas)
+
+
+def co_uso(df, colunas=colunas_uso_internet):
+    matriz, colunas = matriz_uso(df, colunas)
+    m = matriz.astype(np.int32)
+    nomes = [col.replace('usa_internet_', '') for col in colunas]
+    return pd.DataFrame(m.T @ m, index=nomes, columns=nomes)
+
+
+def finalidades_por_aluno(df, colunas=colunas_uso_internet):
+    matriz, _ = matriz_uso(df, colunas)
+    return matriz.sum(axis=1)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# os scripts de scr/ se importam pelo nome, como quando rodam de dentro da pasta
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scr'))
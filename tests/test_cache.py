@@ -0,0 +1,23 @@
+import os
+
+import pytest
+
+from cache import carregar_dados_limpos, feather
+
+
+@pytest.mark.skipif(feather is None, reason='o cache precisa do pyarrow')
+def test_arquivos_de_mesmo_nome_nao_apagam_o_cache_um_do_outro(tmp_path):
+    pasta_cache = str(tmp_path / 'cache')
+    caminhos = []
+    for campus, sexo in (('a', 1), ('b', 2)):
+        (tmp_path / campus).mkdir()
+        caminho = tmp_path / campus / 'dados.csv'
+        caminho.write_text(f'ID,Sexo\n1,{sexo}\n', encoding='utf-8')
+        caminhos.append(str(caminho))
+
+    for caminho in caminhos:
+        carregar_dados_limpos(caminho, pasta_cache=pasta_cache)
+
+    assert len(os.listdir(pasta_cache)) == 2
+    assert carregar_dados_limpos(caminhos[0], pasta_cache=pasta_cache)['sexo'].iloc[0] == 'Masculino'
+    assert carregar_dados_limpos(caminhos[1], pasta_cache=pasta_cache)['sexo'].iloc[0] == 'Feminino'
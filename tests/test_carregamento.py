@@ -0,0 +1,19 @@
+from carregamento import TAMANHO_AMOSTRA, carregar_dados, detectar_encoding
+
+
+def test_byte_latin1_depois_da_amostra(tmp_path, capsys):
+    # a amostra de detectar_encoding é UTF-8 válido; o 'é' em latin-1 só aparece depois dela
+    caminho = tmp_path / 'dados.csv'
+    linhas = ['ID,Sexo,Renda_familiar']
+    n = TAMANHO_AMOSTRA // 20 + 1
+    linhas += [f'{i},1,"R$ 3.000,00"' for i in range(1, n + 1)]
+    conteudo = '\n'.join(linhas).encode('utf-8') + f'\n{n + 1},2,"R$ 1.500,00 (até)"\n'.encode('latin-1')
+    assert len(conteudo) > TAMANHO_AMOSTRA
+    caminho.write_bytes(conteudo)
+    assert detectar_encoding(caminho) == 'utf-8'
+
+    df = carregar_dados(caminho)
+
+    assert len(df) == n + 1
+    assert df['sexo'].iloc[-1] == 'Feminino'
+    assert 'relendo como latin-1' in capsys.readouterr().out
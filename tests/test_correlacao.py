@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+
+from correlacao import calcular_correlacoes, colunas_correlacionaveis
+from preparacao import preparar_dados
+
+
+def test_escala_ordenada_entra_na_matriz_de_correlacao():
+    bruto = pd.DataFrame({'Idade': [18, 20, 22, 24, 26, 28],
+                          'Sentimento_informatica': [1, 1, 2, 2, 3, 3],
+                          'Sexo': [1, 2, 1, 2, 1, 2]})
+    df = preparar_dados(bruto.rename(columns=str.lower))
+
+    colunas = colunas_correlacionaveis(df)
+    assert 'sentimento_informatica' in colunas
+    assert 'sexo' not in colunas
+
+    correlacoes = calcular_correlacoes(df, colunas)
+    # a escala sobe junto com a idade: correlação de postos positiva e forte
+    assert correlacoes['spearman'].loc['idade', 'sentimento_informatica'] > 0.9
+    assert np.isfinite(correlacoes['p_kendall'].loc['idade', 'sentimento_informatica'])
@@ -0,0 +1,19 @@
+import numpy as np
+
+from estimadores import combinar_sketches, quantis, sketch_de
+
+
+def quantis_em_blocos(valores, tamanho=5000):
+    sketch = sketch_de(valores[:tamanho])
+    for inicio in range(tamanho, len(valores), tamanho):
+        sketch = combinar_sketches(sketch, sketch_de(valores[inicio:inicio + tamanho]))
+    return quantis(sketch, [0.1, 0.5, 0.9])
+
+
+def test_quantis_nao_dependem_de_sketches_anteriores():
+    valores = np.random.default_rng(1).normal(size=20_000)
+    antes = quantis_em_blocos(valores)
+    # outros sketches compactando no mesmo processo não podem mudar o resultado
+    sketch_de(np.random.default_rng(2).normal(size=50_000))
+    assert np.array_equal(quantis_em_blocos(valores), antes)
+    np.testing.assert_allclose(antes, np.quantile(valores, [0.1, 0.5, 0.9]), atol=0.05)
@@ -0,0 +1,15 @@
+from manifesto import chave_de_saida, graficos_alterados, hash_do_conteudo
+
+
+def test_qualidade_diferente_redesenha_o_grafico(tmp_path):
+    spec = {'id': 1, 'arquivo': '01_grafico.png'}
+    (tmp_path / '01_grafico.png').write_bytes(b'')
+    previa_50 = chave_de_saida('abc', {'dpi': 50, 'formato': 'png'})
+    previa_80 = chave_de_saida('abc', {'dpi': 80, 'formato': 'png'})
+    manifesto = {spec['arquivo']: previa_50}
+
+    assert graficos_alterados([spec], {spec['arquivo']: previa_50}, tmp_path, manifesto) == []
+    assert graficos_alterados([spec], {spec['arquivo']: previa_80}, tmp_path, manifesto) == [spec]
+    assert graficos_alterados([spec], {spec['arquivo']: chave_de_saida('abc')}, tmp_path, manifesto) == [spec]
+    # o modo final aceita a prévia do mesmo conteúdo, qualquer que tenha sido a qualidade dela
+    assert hash_do_conteudo(previa_50) == hash_do_conteudo(chave_de_saida('abc'))